@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Bench - Offline benchmarks for the search engine
+Usage: python bench.py impacts [--targets ux react ...] [--queries 200] [-k 3] [--json]
+       python bench.py run [--json]
+       python bench.py baseline [--file bench-baseline.json]
+       python bench.py compare [--file bench-baseline.json] [--threshold 0.3] [--metric search.cost=0.5]
+
+impacts   Compare float64 impacts against quantized uint16/uint8 impacts:
+          impact memory per index and how often the top-k ranking is identical.
+run       Run the regression suite: cold index load, core.search and
+          DesignSystemGenerator.generate latency, peak traced memory and
+          index sizes.
+baseline  Run the suite and store its metrics as the baseline.
+compare   Run the suite and diff it against the baseline; exits 1 when a gated
+          metric is worse than baseline * (1 + threshold) and by more than its
+          noise floor. Every metric is lower-is-better.
+
+Latency is timed per batch (every suite query once per round), never gated per
+call. Each batch is bracketed by a fixed pure-Python calibration workload and
+*.cost is the median batch / calibration ratio across rounds: that ratio is
+what compare gates on, because it cancels out CPU speed drift between runs.
+Wall-clock metrics (*_ms: best batch, per-call p50/p99) are informational.
+A run is the per-metric median of --processes fresh interpreters; cost still
+moves by up to ~35% between runs on a shared box, hence the 50% default gate.
+
+The suite measures the in-memory engine: compiled indexes under
+UIPRO_INDEX_DIR are ignored, and index sizes come from explicitly built
+CsvIndex objects. It runs with PYTHONHASHSEED=0. Refresh the baseline
+(python bench.py baseline) when moving to another box or Python version.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import core
+import indexer
+from core import BM25, CSV_CONFIG, DATA_DIR, CsvIndex, _load_csv, load_index, preload, search
+from indexer import all_targets, build_index, resolve_target
+
+IMPACT_VARIANTS = [None, 16, 8]
+
+# ============ REGRESSION SUITE ============
+BENCH_VERSION = 2
+BASELINE_FILE = DATA_DIR.parent / "bench-baseline.json"
+SEARCH_QUERIES_PER_DOMAIN = 25
+GENERATE_QUERIES = ["saas dashboard", "e-commerce luxury fashion", "fintech banking app", "healthcare patient portal",
+                    "gaming landing page", "minimal portfolio", "crypto trading platform", "online education courses"]
+GENERATE_REPEAT = 4  # Passes over GENERATE_QUERIES per timed batch
+ROUNDS = 9
+PROCESSES = 5  # Fresh interpreters per suite run (median per metric)
+# Pure-Python iterations of the calibration workload timed around each batch (a few ms)
+CALIBRATION_LOOPS = 20000
+# Allowed relative regression per metric-name prefix (longest match wins); overridable in the baseline file
+DEFAULT_THRESHOLDS = {"index.": 0.05, "memory.": 0.15, "": 0.50}
+# Differences below these are noise whatever the ratio (by metric-name suffix)
+MIN_DELTA = {"_kb": 64}
+# Wall-clock times are reported for reading; shared or throttled CPUs swing them by half between
+# runs, so latency is gated through the calibrated *.cost ratios instead
+UNGATED_SUFFIXES = ("_ms",)
+
+
+def _sample_queries(bm25, count, seed=7):
+    """Deterministic 1-3 term queries drawn from the index vocabulary"""
+    rng = random.Random(seed)
+    vocab = sorted(bm25.idf)  # every indexed term, for in-memory and compiled indexes alike
+    if not vocab:
+        return []
+    return [" ".join(rng.choices(vocab, k=rng.randint(1, 3))) for _ in range(count)]
+
+
+def compare_impacts(targets=None, n_queries=200, k=3):
+    """Ranking equivalence and memory cost of float vs quantized impacts, per target"""
+    report = []
+    for target in targets or all_targets():
+        filepath, search_cols, _ = resolve_target(target)
+        if not filepath.exists():
+            continue
+        documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in _load_csv(filepath)]
+        indexes = {}
+        for bits in IMPACT_VARIANTS:
+            indexes[bits] = BM25(impact_bits=bits)
+            indexes[bits].fit(documents)
+
+        reference = indexes[None]
+        queries = _sample_queries(reference, n_queries)
+        expected = {q: [idx for idx, _ in reference.score(q, k)] for q in queries}
+        row = {"target": target, "docs": reference.N, "queries": len(queries)}
+        for bits, index in indexes.items():
+            name = "float64" if bits is None else f"uint{bits}"
+            same = overlap = 0
+            for q in queries:
+                got = [idx for idx, _ in index.score(q, k)]
+                same += got == expected[q]
+                overlap += len(set(got) & set(expected[q])) / max(len(expected[q]), 1)
+            row[name] = {
+                "bytes": index.impact_memory(),
+                "identical_top_k": same / len(queries) if queries else 1.0,
+                "overlap_at_k": overlap / len(queries) if queries else 1.0
+            }
+        report.append(row)
+    return report
+
+
+def format_impacts(report, k):
+    """Plain-text table for compare_impacts()"""
+    names = ["float64" if bits is None else f"uint{bits}" for bits in IMPACT_VARIANTS]
+    lines = [f"{'target':<22}{'docs':>6}  " + "  ".join(f"{n + ' bytes':>14}{'same@' + str(k):>9}{'ovl@' + str(k):>8}" for n in names)]
+    for row in report:
+        cells = "  ".join(f"{row[n]['bytes']:>14,}{row[n]['identical_top_k']:>9.1%}{row[n]['overlap_at_k']:>8.1%}" for n in names)
+        lines.append(f"{row['target']:<22}{row['docs']:>6}  {cells}")
+    totals = {n: sum(row[n]["bytes"] for row in report) for n in names}
+    lines.append("total bytes: " + ", ".join(f"{n} {totals[n]:,}" for n in names))
+    return "\n".join(lines)
+
+
+def _percentiles(latencies):
+    """p50/p99 in ms of a list of seconds"""
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return {"p50_ms": pick(0.50), "p99_ms": pick(0.99)}
+
+
+def _calibration():
+    """Fixed pure-Python workload timed around every batch; machine speed drift cancels out of the ratio"""
+    counts = {}
+    for i in range(CALIBRATION_LOOPS):
+        counts[i % 97] = counts.get(i % 97, 0) + len(str(i))
+
+
+def _timed(fn):
+    """Seconds one call of fn takes"""
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def _best_of(rounds, calls):
+    """
+    Time every call once per round, after one warm-up round.
+
+    Returns batch_ms (best whole-batch time), cost (median over rounds of
+    the batch time / the calibration time around it) and p50/p99 over calls
+    of each call's best latency.
+    """
+    best = [float("inf")] * len(calls)
+    batches, ratios = [], []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # a collection landing in one batch but not the next is noise, not a regression
+    try:
+        _rounds(rounds, calls, best, batches, ratios)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {"batch_ms": min(batches) * 1000, "cost": statistics.median(ratios), **_percentiles(best)}
+
+
+def _rounds(rounds, calls, best, batches, ratios):
+    for round_no in range(rounds + 1):
+        before = _timed(_calibration)
+        batch_started = time.perf_counter()
+        for i, (fn, args) in enumerate(calls):
+            started = time.perf_counter()
+            fn(*args)
+            best[i] = min(best[i], time.perf_counter() - started)
+        batch = time.perf_counter() - batch_started
+        after = _timed(_calibration)
+        if round_no:
+            batches.append(batch)
+            ratios.append(batch / ((before + after) / 2))
+        else:
+            best[:] = [float("inf")] * len(calls)
+
+
+def _suite_queries():
+    """Deterministic (query, domain) pairs: sampled vocabulary queries for every domain"""
+    calls = []
+    for domain, config in CSV_CONFIG.items():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            index = load_index(filepath, config["search_cols"], config["output_cols"])
+            calls += [(query, domain) for query in _sample_queries(index, SEARCH_QUERIES_PER_DOMAIN)]
+    return calls
+
+
+def run_suite(rounds=ROUNDS, processes=PROCESSES):
+    """
+    Metrics of the suite: {name: value}, every value lower-is-better.
+
+    With processes > 1 the suite runs that many times, each in a fresh
+    interpreter, and every metric is the median across runs: memory layout
+    differs per process and moves timings more than any in-process repeat.
+    """
+    if processes <= 1:
+        return _run_in_process(rounds)
+    runs = []
+    for _ in range(processes):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "run", "--json",
+                              "--rounds", str(rounds), "--processes", "1"],
+                             check=True, capture_output=True, text=True, env={**os.environ, "PYTHONHASHSEED": "0"})
+        runs.append(json.loads(out.stdout))
+    return {name: round(statistics.median(run[name] for run in runs), 4) for name in runs[0]}
+
+
+def _run_in_process(rounds):
+    """One suite run in this interpreter"""
+    # Compiled indexes built with `indexer.py build` would switch searches to the disk engine
+    # and make runs incomparable with the baseline: point the indexer at an empty dir meanwhile
+    work_dir = Path(tempfile.mkdtemp(prefix="uipro-bench-"))
+    index_dir, indexer.INDEX_DIR = indexer.INDEX_DIR, work_dir / "index"
+    core._INDEX_CACHE.clear()
+    try:
+        return _run_suite(rounds, work_dir)
+    finally:
+        indexer.INDEX_DIR = index_dir
+        core._INDEX_CACHE.clear()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _run_suite(rounds, work_dir):
+    from design_system import get_generator
+
+    metrics = {}
+    stacks = list(core.STACK_CONFIG)
+
+    # Cold load of every domain and stack index, then its traced peak
+    def cold_load():
+        core._INDEX_CACHE.clear()
+        preload(None, stacks)
+    timing = _best_of(rounds, [(cold_load, ())])
+    metrics["load.all_ms"] = timing["batch_ms"]
+    metrics["load.cost"] = timing["cost"]
+    core._INDEX_CACHE.clear()
+    tracemalloc.start()
+    preload(None, stacks)
+    metrics["memory.load_peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    calls = [(search, (query, domain)) for query, domain in _suite_queries()]
+    metrics.update({f"search.{name}": value for name, value in _best_of(rounds, calls).items()})
+
+    generator = get_generator()
+    calls = [(generator.generate, (query,)) for query in GENERATE_QUERIES] * GENERATE_REPEAT
+    metrics.update({f"generate.{name}": value for name, value in _best_of(rounds, calls).items()})
+    tracemalloc.start()
+    for query in GENERATE_QUERIES:
+        generator.generate(query)
+    metrics["memory.generate_peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    # Index sizes: in-memory impacts and postings, and the compiled on-disk form
+    impact_bytes = postings = disk_bytes = 0
+    for i, target in enumerate(all_targets()):
+        filepath, search_cols, output_cols = resolve_target(target)
+        if not filepath.exists():
+            continue
+        index = CsvIndex(filepath, search_cols, output_cols)
+        impact_bytes += index.impact_memory()
+        postings += sum(len(docs) for docs in index.postings.values())
+        out_dir = build_index(filepath, search_cols, output_cols, out_dir=work_dir / "sizes" / str(i))
+        disk_bytes += sum(f.stat().st_size for f in out_dir.rglob("*") if f.is_file())
+    metrics["index.impact_bytes"] = impact_bytes
+    metrics["index.postings"] = postings
+    metrics["index.disk_bytes"] = disk_bytes
+    return {name: round(value, 4) for name, value in metrics.items()}
+
+
+def _environment():
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()}
+
+
+def write_baseline(metrics, path=BASELINE_FILE):
+    """Store metrics as the baseline, keeping any thresholds already configured in the file"""
+    path = Path(path)
+    thresholds = {}
+    if path.exists():
+        # Thresholds carry over even from a baseline of an older BENCH_VERSION
+        with open(path, "r", encoding="utf-8") as f:
+            thresholds = json.load(f).get("thresholds", {})
+    baseline = {"version": BENCH_VERSION, "environment": _environment(), "thresholds": thresholds, "metrics": metrics}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return baseline
+
+
+def load_baseline(path=BASELINE_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BENCH_VERSION:
+        raise ValueError(f"Baseline {path} is version {baseline.get('version')}, expected {BENCH_VERSION}; "
+                         f"re-run: python bench.py baseline")
+    return baseline
+
+
+def _threshold(name, thresholds):
+    """Allowed relative regression for a metric: exact name, else longest matching prefix"""
+    if name in thresholds:
+        return thresholds[name]
+    prefix = max((p for p in thresholds if name.startswith(p)), key=len, default=None)
+    return thresholds[prefix] if prefix is not None else DEFAULT_THRESHOLDS[""]
+
+
+def compare(baseline, current, threshold=None, overrides=None):
+    """
+    Per-metric diff of a run against a baseline.
+
+    Thresholds resolve as: overrides (per metric), then threshold (global),
+    then the baseline file's "thresholds", then DEFAULT_THRESHOLDS.
+    Returns [{metric, baseline, current, change, limit, status}] with status
+    "regressed", "improved", "ok", "info" (ungated), "new" or "missing".
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {})}
+    if threshold is not None:
+        thresholds = {"": threshold}
+    thresholds.update(overrides or {})
+
+    rows = []
+    for name in sorted(set(baseline["metrics"]) | set(current)):
+        old, new = baseline["metrics"].get(name), current.get(name)
+        if old is None or new is None:
+            rows.append({"metric": name, "baseline": old, "current": new, "change": None, "limit": None,
+                         "status": "new" if old is None else "missing"})
+            continue
+        change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+        if name.endswith(UNGATED_SUFFIXES):
+            rows.append({"metric": name, "baseline": old, "current": new, "change": change, "limit": None, "status": "info"})
+            continue
+        limit = _threshold(name, thresholds)
+        min_delta = next((delta for suffix, delta in MIN_DELTA.items() if name.endswith(suffix)), 0)
+        if change > limit and new - old > min_delta:
+            status = "regressed"
+        elif change < -limit and old - new > min_delta:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"metric": name, "baseline": old, "current": new, "change": change, "limit": limit, "status": status})
+    return rows
+
+
+def format_compare(rows):
+    """Readable diff table; regressions are listed again at the bottom"""
+    fmt = lambda value: "-" if value is None else f"{value:,.3f}" if isinstance(value, float) and value < 1000 else f"{value:,.0f}"
+    lines = [f"{'metric':<26}{'baseline':>14}{'current':>14}{'change':>10}{'limit':>8}  status"]
+    for row in rows:
+        change = "-" if row["change"] is None else f"{row['change']:+.1%}"
+        limit = "-" if row["limit"] is None else f"{row['limit']:.0%}"
+        lines.append(f"{row['metric']:<26}{fmt(row['baseline']):>14}{fmt(row['current']):>14}{change:>10}{limit:>8}  {row['status']}")
+    regressed = [row for row in rows if row["status"] == "regressed"]
+    if regressed:
+        lines.append("")
+        lines.append(f"{len(regressed)} metric(s) regressed:")
+        for row in regressed:
+            lines.append(f"  {row['metric']}: {fmt(row['baseline'])} -> {fmt(row['current'])} "
+                         f"({row['change']:+.1%}, allowed +{row['limit']:.0%})")
+    else:
+        lines.append("")
+        lines.append("No regressions.")
+    return "\n".join(lines)
+
+
+def _metric_override(text):
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=FRACTION, got {text!r}")
+    return name, float(value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max Bench")
+    sub = parser.add_subparsers(dest="command", required=True)
+    impacts = sub.add_parser("impacts", help="Compare float vs quantized impact rankings and memory")
+    impacts.add_argument("--targets", nargs="+", default=None, help="Domain names or stack:<name> (default: all)")
+    impacts.add_argument("--queries", type=int, default=200, help="Sampled queries per target (default: 200)")
+    impacts.add_argument("-k", type=int, default=3, help="Ranking depth compared (default: 3)")
+    impacts.add_argument("--json", action="store_true", help="Output as JSON")
+    run = sub.add_parser("run", help="Run the regression suite and print its metrics")
+    run.add_argument("--rounds", type=int, default=ROUNDS, help=f"Timing rounds per batch (default: {ROUNDS})")
+    run.add_argument("--processes", type=int, default=PROCESSES, help=f"Suite runs in fresh interpreters, median kept (default: {PROCESSES})")
+    run.add_argument("--json", action="store_true", help="Output as JSON")
+    base = sub.add_parser("baseline", help="Run the suite and store it as the baseline")
+    base.add_argument("--file", type=str, default=str(BASELINE_FILE), help="Baseline JSON (default: skill dir)")
+    base.add_argument("--rounds", type=int, default=ROUNDS, help=f"Timing rounds per batch (default: {ROUNDS})")
+    base.add_argument("--processes", type=int, default=PROCESSES, help=f"Suite runs in fresh interpreters, median kept (default: {PROCESSES})")
+    cmp_ = sub.add_parser("compare", help="Run the suite and fail on regressions against the baseline")
+    cmp_.add_argument("--file", type=str, default=str(BASELINE_FILE), help="Baseline JSON (default: skill dir)")
+    cmp_.add_argument("--rounds", type=int, default=ROUNDS, help=f"Timing rounds per batch (default: {ROUNDS})")
+    cmp_.add_argument("--processes", type=int, default=PROCESSES, help=f"Suite runs in fresh interpreters, median kept (default: {PROCESSES})")
+    cmp_.add_argument("--threshold", type=float, default=None, help="Allowed relative regression for every metric (e.g. 0.3)")
+    cmp_.add_argument("--metric", type=_metric_override, action="append", default=[],
+                      help="Per-metric threshold NAME=FRACTION or PREFIX=FRACTION (repeatable)")
+    cmp_.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    # Set iteration order (and with it scoring work) depends on str hashing: pin it so runs compare
+    if args.command != "impacts" and os.environ.get("PYTHONHASHSEED") != "0":
+        os.execve(sys.executable, [sys.executable] + sys.argv, {**os.environ, "PYTHONHASHSEED": "0"})
+
+    if args.command == "impacts":
+        report = compare_impacts(args.targets, args.queries, args.k)
+        print(json.dumps(report, indent=2) if args.json else format_impacts(report, args.k))
+    elif args.command == "run":
+        metrics = run_suite(args.rounds, args.processes)
+        print(json.dumps(metrics, indent=2) if args.json else "\n".join(f"{k:<26}{v:>14,}" for k, v in metrics.items()))
+    elif args.command == "baseline":
+        baseline = write_baseline(run_suite(args.rounds, args.processes), args.file)
+        print(f"Baseline with {len(baseline['metrics'])} metrics written to {args.file}")
+    else:
+        try:
+            baseline = load_baseline(args.file)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+        rows = compare(baseline, run_suite(args.rounds, args.processes), args.threshold, dict(args.metric))
+        print(json.dumps(rows, indent=2) if args.json else format_compare(rows))
+        sys.exit(1 if any(row["status"] == "regressed" for row in rows) else 0)
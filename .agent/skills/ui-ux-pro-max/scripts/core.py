@@ -5,15 +5,30 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import heapq
+import os
+import pickle
 import re
+import threading
+import time
+from array import array
+from functools import wraps
 from pathlib import Path
 from math import log
 from collections import defaultdict
 
+import telemetry
+
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
 
+# Stored BM25 impact precision for in-memory indexes: unset = float64, 16/8 = quantized uint16/uint8
+IMPACT_BITS = int(os.environ["UIPRO_IMPACT_BITS"]) if os.environ.get("UIPRO_IMPACT_BITS") else None
+
+# CSVs larger than this (or prebuilt with `indexer.py build`) are searched through a compiled on-disk index
+STREAM_THRESHOLD_BYTES = int(os.environ.get("UIPRO_STREAM_THRESHOLD_MB", "8")) * 1024 * 1024
+
 CSV_CONFIG = {
     "style": {
         "file": "styles.csv",
@@ -93,17 +108,39 @@ AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
 # ============ BM25 IMPLEMENTATION ============
+PHRASE_BOOST = 1.0      # Extra weight (x phrase idf) for a matched "quoted phrase"
+PROXIMITY_WEIGHT = 0.5  # Extra weight (x pair idf / distance) for adjacent query terms
+PROXIMITY_WINDOW = 3    # Max token distance for a query term pair to count as near
+IMPACT_BLOCK = 32       # Postings consumed per term before the first early-exit check
+EARLY_EXIT_MIN_POSTINGS = 2048  # Query postings needed before early exit is tried (None: never)
+DOC_VALUES_CACHE = 256  # Terms whose {doc: impact} lookup is kept for early exit
+_IMPACT_TYPECODES = {None: "d", 8: "B", 16: "H"}
+
+
+def bm25_impact(tf, idf, doc_len, avgdl, k1, b):
+    """BM25 contribution of one term to one document"""
+    numerator = tf * (k1 + 1)
+    denominator = tf + k1 * (1 - b + b * doc_len / avgdl)
+    return idf * numerator / denominator
+
+
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search with positional postings and precomputed impacts"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, impact_bits=None):
+        if impact_bits not in _IMPACT_TYPECODES:
+            raise ValueError(f"impact_bits must be one of {list(_IMPACT_TYPECODES)}")
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.impact_bits = impact_bits  # None: float64 impacts, 8/16: quantized uint8/uint16
+        self.impact_scale = 1.0
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
+        self.postings = {}  # term -> {doc_idx: [positions]}
+        self.impacts = {}   # term -> (doc ids, impacts), highest impact first
+        self._doc_values_cache = {}  # term -> {doc id: impact}, see _doc_values
         self.N = 0
 
     def tokenize(self, text):
@@ -111,48 +148,284 @@ class BM25:
         text = re.sub(r'[^\w\s]', ' ', str(text).lower())
         return [w for w in text.split() if len(w) > 2]
 
+    def parse_query(self, query):
+        """Split query into tokens and "quoted phrases" (as token lists)"""
+        phrases = [p for p in (self.tokenize(m) for m in re.findall(r'"([^"]+)"', str(query))) if p]
+        return self.tokenize(query), phrases
+
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Build BM25 index from documents (any iterable, consumed once)"""
+        for idx, doc in enumerate(documents):
+            tokens = self.tokenize(doc)
+            self.doc_lengths.append(len(tokens))
+            for pos, word in enumerate(tokens):
+                self.postings.setdefault(word, {}).setdefault(idx, []).append(pos)
+        self.N = len(self.doc_lengths)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        for word, docs in self.postings.items():
+            self.doc_freqs[word] = len(docs)
 
         for word, freq in self.doc_freqs.items():
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
+        self._build_impacts()
+
+    def _impact(self, term, doc_idx):
+        """Stored (possibly quantized) impact of a term in a document"""
+        exact = bm25_impact(len(self.postings[term][doc_idx]), self.idf[term], self.doc_lengths[doc_idx], self.avgdl, self.k1, self.b)
+        return self._quantize(exact) if self.impact_bits else exact
+
+    def _quantize(self, value):
+        """Map an exact impact onto the integer grid (never to 0, so matches still score)"""
+        return max(1, round(value / self.impact_scale))
+
+    def _build_impacts(self):
+        """Precompute every posting's BM25 contribution, sorted by impact"""
+        if self.impact_bits:
+            peak = max((bm25_impact(len(positions), self.idf[term], self.doc_lengths[idx], self.avgdl, self.k1, self.b)
+                        for term, docs in self.postings.items() for idx, positions in docs.items()), default=1.0)
+            self.impact_scale = peak / ((1 << self.impact_bits) - 1)
+        typecode = _IMPACT_TYPECODES[self.impact_bits]
+        for term, docs in self.postings.items():
+            ordered = sorted(((self._impact(term, idx), idx) for idx in docs), key=lambda x: (-x[0], x[1]))
+            self.impacts[term] = (array("I", [idx for _, idx in ordered]), array(typecode, [v for v, _ in ordered]))
+
+    def impact_memory(self):
+        """Bytes held by the impact arrays (doc ids + impact values)"""
+        return sum(docs.itemsize * len(docs) + values.itemsize * len(values) for docs, values in self.impacts.values())
+
+    def _matching_all(self, terms):
+        """Doc ids containing every term, smallest postings list first"""
+        lists = sorted((self.postings.get(t, {}) for t in set(terms)), key=len)
+        if not lists or not lists[0]:
+            return []
+        return [d for d in lists[0] if all(d in other for other in lists[1:])]
+
+    def _phrase_match(self, doc_idx, terms):
+        """True if terms occur consecutively in the document"""
+        starts = self.postings[terms[0]][doc_idx]
+        following = [set(self.postings[t][doc_idx]) for t in terms[1:]]
+        return any(all(s + i in pos for i, pos in enumerate(following, 1)) for s in starts)
+
+    def _min_distance(self, doc_idx, first, second):
+        """Smallest forward distance from first to second term in a document"""
+        firsts = self.postings[first][doc_idx]
+        best, i = None, 0
+        for pos in self.postings[second][doc_idx]:
+            while i < len(firsts) and firsts[i] < pos:
+                i += 1
+            if i and (best is None or pos - firsts[i - 1] < best):
+                best = pos - firsts[i - 1]
+        return best
+
+    def _sum_impacts(self, query_tokens, impacts=None):
+        """BM25 score of every candidate as a plain sum of stored impacts"""
+        impacts = self.impacts if impacts is None else impacts
+        candidates = sorted({d for t in query_tokens if t in impacts for d in impacts[t][0]})
+        scores = dict.fromkeys(candidates, 0)
+        for token in query_tokens:
+            if token in impacts:
+                for idx, value in zip(*impacts[token]):
+                    scores[idx] += value
+        if self.impact_bits:
+            scores = {idx: total * self.impact_scale for idx, total in scores.items()}
+        return scores
+
+    def _doc_values(self, term, impacts):
+        """{doc id: stored impact} of a term, for random access; built once per term"""
+        cached = self._doc_values_cache.get(term)
+        if cached is None:
+            cached = dict(zip(*impacts[term]))
+            if len(self._doc_values_cache) >= DOC_VALUES_CACHE:
+                self._doc_values_cache.clear()
+            self._doc_values_cache[term] = cached
+        return cached
+
+    def _proximity(self, query_tokens, idx, score):
+        """Add boosts for adjacent query terms that also sit close together in the doc"""
+        for first, second in zip(query_tokens, query_tokens[1:]):
+            if first == second or first not in self.postings or second not in self.postings:
+                continue
+            if idx not in self.postings[first] or idx not in self.postings[second]:
+                continue
+            distance = self._min_distance(idx, first, second)
+            if distance is not None and distance <= PROXIMITY_WINDOW:
+                score += PROXIMITY_WEIGHT * (self.idf[first] + self.idf[second]) / distance
+        return score
+
+    def _top_k_impacts(self, query_tokens, k, impacts=None):
+        """
+        Threshold-algorithm early exit over impact-ordered postings.
+
+        Lists are read in blocks that double in size; each newly seen document
+        is scored exactly (including proximity) from the stored impacts, looked
+        up through each term's _doc_values. Reading stops once the k-th best
+        score beats anything an unseen document could still reach: the next
+        unread impact of every list plus the maximum proximity boost.
+        Returns final scores (proximity applied) for the top k documents.
+        """
+        impacts = self.impacts if impacts is None else impacts
+        lists = [impacts[t] for t in query_tokens if t in impacts]
+        lookups = [self._doc_values(t, impacts) for t in query_tokens if t in impacts]
+        scale = self.impact_scale if self.impact_bits else 1
+        bonus = sum(PROXIMITY_WEIGHT * (self.idf[a] + self.idf[b]) for a, b in zip(query_tokens, query_tokens[1:])
+                    if a != b and a in self.idf and b in self.idf)
+        exact = {}
+        cursors = [0] * len(lists)
+        block = IMPACT_BLOCK
+
+        while lists:
+            for i, (docs, values) in enumerate(lists):
+                end = min(cursors[i] + block, len(docs))
+                for idx in docs[cursors[i]:end]:
+                    if idx not in exact:
+                        # Same sum, in the same order, as _sum_impacts
+                        total = 0
+                        for lookup in lookups:
+                            total += lookup.get(idx, 0)
+                        exact[idx] = self._proximity(query_tokens, idx, total * scale)
+                cursors[i] = end
+            frontier = sum(values[c] for (_, values), c in zip(lists, cursors) if c < len(values))
+            if frontier == 0:
+                break
+            block *= 2
+            if len(exact) >= k:
+                threshold = frontier * self.impact_scale + bonus
+                if heapq.nlargest(k, exact.values())[-1] > threshold:
+                    break
+
+        top = heapq.nsmallest(k, exact.items(), key=lambda x: (-x[1], x[0]))
+        return dict(top)
+
+    def score(self, query, k=None):
+        """
+        Score documents matching the query, with phrase and proximity boosts.
+
+        With k set only the top k documents are returned; for plain queries
+        over long postings lists this uses impact-ordered early exit.
+        """
+        query_tokens, phrases = self.parse_query(query)
+        return self._rank(query_tokens, phrases, k, self.impacts)
+
+    def score_many(self, lookups):
+        """
+        score() for a batch of (query, k) lookups: {query: ranking}.
+
+        Each distinct query is parsed and ranked once, with the largest k asked
+        for it (smaller lookups take a prefix), and the impact list of each
+        distinct term is fetched once for the whole batch, so queries sharing
+        terms share their postings reads.
+        """
+        wanted = {}
+        for query, k in lookups:
+            wanted[query] = max(wanted.get(query, 0), k)
+        parsed = {query: self.parse_query(query) for query in wanted}
+        impacts = {}
+        for query_tokens, _ in parsed.values():
             for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+                if token not in impacts and token in self.impacts:
+                    impacts[token] = self.impacts[token]
+        return {query: self._rank(query_tokens, phrases, wanted[query], impacts)
+                for query, (query_tokens, phrases) in parsed.items()}
+
+    def _rank(self, query_tokens, phrases, k, impacts):
+        """Ranking of a parsed query, read from impacts (self.impacts or a batch's subset of it)"""
+        if k and not phrases and EARLY_EXIT_MIN_POSTINGS is not None and \
+                sum(len(impacts[t][0]) for t in query_tokens if t in impacts) >= EARLY_EXIT_MIN_POSTINGS:
+            return sorted(self._top_k_impacts(query_tokens, k, impacts).items(), key=lambda x: (-x[1], x[0]))
+
+        scores = self._sum_impacts(query_tokens, impacts)
+
+        # Quoted phrases boost the docs holding them exactly; partial matches still rank below
+        for phrase in phrases:
+            phrase_idf = sum(self.idf.get(t, 0) for t in phrase)
+            for d in self._matching_all(phrase):
+                if d in scores and self._phrase_match(d, phrase):
+                    scores[d] += PHRASE_BOOST * phrase_idf
+
+        scores = {idx: self._proximity(query_tokens, idx, value) for idx, value in scores.items()}
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return ranked[:k] if k else ranked
+
+
+# ============ PATTERN MATCHING ============
+class PatternAutomaton:
+    """Aho-Corasick automaton: finds every occurrence of many literal patterns in one pass"""
+
+    def __init__(self, patterns):
+        """patterns: iterable of (pattern, payload); empty patterns are ignored"""
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # state -> [(pattern length, payload)], including suffix matches
+        for pattern, payload in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = self._goto[state][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), payload))
+
+        queue = list(self._goto[0].values())  # depth-1 states fail back to the root
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def matches(self, text):
+        """Yield (start, end, payload) for every pattern occurrence in text"""
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, payload in self._out[state]:
+                yield end - length, end, payload
+
+
+# ============ RESULT ROWS ============
+def normalize_text(text):
+    """Lowercase, punctuation to spaces, single-spaced: the form result fields are matched in"""
+    return " ".join(re.sub(r'[^\w\s]', ' ', str(text).lower()).split())
+
+
+class RowView:
+    """Normalized, tokenized view of a result row's fields, built once per indexed document"""
+
+    __slots__ = ("fields", "text", "tokens")
+
+    def __init__(self, row):
+        self.fields = {col: normalize_text(value) for col, value in row.items()}
+        self.text = " ".join(self.fields.values())
+        self.tokens = frozenset(self.text.split())
+
+    def get(self, col):
+        """Normalized value of one column ("" if absent)"""
+        return self.fields.get(col, "")
+
+    def contains(self, phrase):
+        """True if a normalized phrase occurs in any field; single tokens are a set lookup"""
+        return phrase in self.tokens or phrase in self.text
+
+
+class Row(dict):
+    """A search result: the row's output columns, plus its RowView as .view"""
+
+    def __init__(self, data, view=None):
+        super().__init__(data)
+        self.view = view if view is not None else RowView(self)
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -162,53 +435,172 @@ def _load_csv(filepath):
         return list(csv.DictReader(f))
 
 
+class CsvIndex(BM25):
+    """In-memory BM25 over a CSV file, keeping the output columns of each row"""
+
+    def __init__(self, filepath, search_cols, output_cols, impact_bits=None):
+        super().__init__(impact_bits=impact_bits)
+        data = _load_csv(filepath)
+        self.rows = [{col: row.get(col, "") for col in output_cols if col in row} for row in data]
+        self.fit(" ".join(str(row.get(col, "")) for col in search_cols) for row in data)
+        self.views = [RowView(row) for row in self.rows]
+
+    def fetch(self, doc_idx):
+        """Output columns of a document"""
+        return self.rows[doc_idx]
+
+    def row(self, doc_idx):
+        """Result row of a document, with the view computed at index time"""
+        return Row(self.rows[doc_idx], self.views[doc_idx])
+
+
+_INDEX_CACHE = {}
+_INDEX_LOCKS = {}
+_SNAPSHOT = {}  # component key -> (source fingerprint, pickled bytes), installed by snapshot.restore()
+_LOCAL = threading.local()  # per thread: index loads so far, telemetry kinds being timed
+
+
+def _from_snapshot(key, fingerprint):
+    """Unpickle a snapshot component on first use, if its source is unchanged (None otherwise)"""
+    entry = _SNAPSHOT.pop(key, None)
+    if entry is None or entry[0] != fingerprint:
+        return None
+    try:
+        return pickle.loads(entry[1])
+    except Exception:
+        return None
+
+
+def load_index(filepath, search_cols, output_cols):
+    """Index for a CSV shared by every search in this process, reloaded when the file changes"""
+    stat = filepath.stat()
+    key = (str(filepath), tuple(search_cols), tuple(output_cols))
+    fingerprint = (stat.st_size, stat.st_mtime_ns)
+    cached = _INDEX_CACHE.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    # One loader per file; other threads wait for it instead of loading the same CSV again
+    with _INDEX_LOCKS.setdefault(key, threading.Lock()):
+        cached = _INDEX_CACHE.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        index = _from_snapshot(key, fingerprint)
+        if index is None:
+            from indexer import has_index, open_index
+            if stat.st_size > STREAM_THRESHOLD_BYTES or has_index(filepath, search_cols):
+                index = open_index(filepath, search_cols, output_cols)
+            else:
+                index = CsvIndex(filepath, search_cols, output_cols, IMPACT_BITS)
+        _INDEX_CACHE[key] = (fingerprint, index)
+        _LOCAL.loads = getattr(_LOCAL, "loads", 0) + 1
+    return index
+
+
+def preload(domains=None, stacks=()):
+    """Load domain (default: all) and stack indexes into the shared cache; returns what was loaded"""
+    targets = []
+    for domain in CSV_CONFIG if domains is None else domains:
+        config = CSV_CONFIG[domain]
+        targets.append((domain, DATA_DIR / config["file"], config["search_cols"], config["output_cols"]))
+    for stack in stacks:
+        targets.append((f"stack:{stack}", DATA_DIR / STACK_CONFIG[stack]["file"],
+                        _STACK_COLS["search_cols"], _STACK_COLS["output_cols"]))
+    targets = [target for target in targets if target[1].exists()]
+
+    # Compiled indexes that load_index would (re)build one by one are built across a process pool first
+    from indexer import build_indexes, has_index
+    compiled = [name for name, filepath, search_cols, _ in targets
+                if filepath.stat().st_size > STREAM_THRESHOLD_BYTES or has_index(filepath, search_cols)]
+    if len(compiled) > 1:
+        build_indexes(compiled)
+
+    for _, filepath, search_cols, output_cols in targets:
+        load_index(filepath, search_cols, output_cols)
+    return [name for name, _, _, _ in targets]
+
+
+def instrumented(kind):
+    """
+    Decorator appending a telemetry record per call of a function returning a result dict.
+
+    Resolved at import: without UIPRO_TELEMETRY_LOG the function is returned
+    unwrapped. A call nested in another of the same kind (search_stack("auto")
+    delegating to one stack) is not recorded twice. cache_hit is True when the
+    call loaded no index.
+    """
+    def decorate(fn):
+        if not telemetry.enabled():
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            active = getattr(_LOCAL, "active", None)
+            if active is None:
+                active = _LOCAL.active = set()
+            if kind in active:
+                return fn(*args, **kwargs)
+            active.add(kind)
+            loads = getattr(_LOCAL, "loads", 0)
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                active.discard(kind)
+            telemetry.record_result(kind, result, started, getattr(_LOCAL, "loads", 0) == loads)
+            return result
+        return wrapper
+    return decorate
+
+
 def _search_csv(filepath, search_cols, output_cols, query, max_results):
     """Core search function using BM25"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
+    index = load_index(filepath, search_cols, output_cols)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    # Get top results with score > 0
+    return [index.row(idx) for idx, score in index.score(query, max_results) if score > 0]
+
+
+DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
+    "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora", "prompt", "css", "implementation", "variable", "checklist", "tailwind"],
+    "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
+    "typography": ["font", "typography", "heading", "serif", "sans"],
+    "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
+    "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
+    "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
+}
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+_DOMAIN_MATCHER = None
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
 
-    return results
+def get_domain_matcher():
+    """Automaton over every DOMAIN_KEYWORDS keyword, payload (domain, keyword)"""
+    global _DOMAIN_MATCHER
+    if _DOMAIN_MATCHER is None:
+        _DOMAIN_MATCHER = _from_snapshot("domain_matcher", None) or PatternAutomaton(
+            (kw, (domain, kw)) for domain, keywords in DOMAIN_KEYWORDS.items() for kw in keywords)
+    return _DOMAIN_MATCHER
 
 
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora", "prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font", "typography", "heading", "serif", "sans"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
-    }
-
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
+    # One automaton pass; a domain scores one point per distinct keyword of it found in the query
+    found = {payload for _, _, payload in get_domain_matcher().matches(query.lower())}
+    scores = dict.fromkeys(DOMAIN_KEYWORDS, 0)
+    for domain, _ in found:
+        scores[domain] += 1
     best = max(scores, key=scores.get)
     return best if scores[best] > 0 else "style"
 
 
+@instrumented("search")
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
     if domain is None:
@@ -231,8 +623,81 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     }
 
 
-def search_stack(query, stack, max_results=MAX_RESULTS):
-    """Search stack-specific guidelines"""
+def search_many(lookups, domain):
+    """
+    Run several (query, max_results) lookups against one domain; results in input order.
+
+    The index is loaded once and the lookups are ranked together by
+    BM25.score_many. Each result is the one search(query, domain, max_results)
+    returns; with telemetry on, each lookup is recorded with its share of the batch time.
+    """
+    lookups = list(lookups)
+    config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+    filepath = DATA_DIR / config["file"]
+    if not filepath.exists():
+        return [{"error": f"File not found: {filepath}", "domain": domain} for _ in lookups]
+
+    loads = getattr(_LOCAL, "loads", 0)
+    started = time.perf_counter()
+    index = load_index(filepath, config["search_cols"], config["output_cols"])
+    rankings = index.score_many(lookups)
+    results = []
+    for query, max_results in lookups:
+        rows = [index.row(idx) for idx, score in rankings[query][:max_results] if score > 0]
+        results.append({
+            "domain": domain,
+            "query": query,
+            "file": config["file"],
+            "count": len(rows),
+            "results": rows
+        })
+    if telemetry.enabled() and results:
+        share = (time.perf_counter() - started) / len(results)
+        cache_hit = getattr(_LOCAL, "loads", 0) == loads
+        for result in results:
+            telemetry.record("search", result["query"], domain, share, cache_hit, result["count"])
+    return results
+
+
+def _search_detected(query, project_dir, max_results):
+    """Search the stacks detected in a project dir; several stacks are merged by BM25 score"""
+    from stacks import detect_stacks
+    detected = detect_stacks(project_dir)
+    stacks = [stack for stack in detected["stacks"] if (DATA_DIR / STACK_CONFIG[stack]["file"]).exists()]
+    if not stacks:
+        return {"error": f"No stack detected in {detected['dir']}. Pass one of: {', '.join(AVAILABLE_STACKS)}",
+                "stack": "auto", "query": query}
+    if len(stacks) == 1:
+        return {**search_stack(query, stacks[0], max_results), "detected": stacks}
+
+    ranked = []
+    for stack in stacks:
+        index = load_index(DATA_DIR / STACK_CONFIG[stack]["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"])
+        ranked.extend((score, stack, index, idx) for idx, score in index.score(query, max_results) if score > 0)
+    # Ties keep the detection order (strongest stack first)
+    ranked = heapq.nsmallest(max_results, ranked, key=lambda item: (-item[0], stacks.index(item[1])))
+    results = []
+    for _, stack, index, idx in ranked:
+        row = index.row(idx)
+        row["Stack"] = stack
+        results.append(row)
+
+    return {
+        "domain": "stack",
+        "stack": ", ".join(stacks),
+        "detected": stacks,
+        "query": query,
+        "file": ", ".join(STACK_CONFIG[stack]["file"] for stack in stacks),
+        "count": len(results),
+        "results": results
+    }
+
+
+@instrumented("stack")
+def search_stack(query, stack, max_results=MAX_RESULTS, project_dir=None):
+    """Search stack-specific guidelines; stack="auto" detects the stack(s) of project_dir (default: cwd)"""
+    if stack == "auto":
+        return _search_detected(query, project_dir, max_results)
     if stack not in STACK_CONFIG:
         return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
 
@@ -11,18 +11,34 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+    result = generate_design_system("SaaS dashboard", "My Project", persist=True, page=["dashboard", "settings"])
+
+    # Many projects from a manifest (JSON/CSV of project, query, pages)
+    report = generate_batch("tenants.json", output_dir="out", workers=8)
+
+    # Several formats from one render pass, or streamed to a file
+    outputs = render(design_system, ["ascii", "markdown", "master"])
+    render_to(sys.stdout, design_system, "markdown")
 """
 
 import csv
+import hashlib
 import json
 import os
-from datetime import datetime
+import re
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
-from core import search, DATA_DIR
+import telemetry
+from core import search_many, preload, CSV_CONFIG, DATA_DIR, PatternAutomaton, RowView, normalize_text, _from_snapshot
 
 
 # ============ CONFIGURATION ============
 REASONING_FILE = "ui-reasoning.csv"
+PAGE_TYPES_FILE = "page-types.csv"
 
 SEARCH_CONFIG = {
     "product": {"max_results": 1},
@@ -32,13 +48,135 @@ SEARCH_CONFIG = {
     "typography": {"max_results": 2}
 }
 
+# Indexes loaded by warm(): everything a design system run (with page overrides) touches
+WARM_DOMAINS = ["product", "style", "color", "landing", "typography", "ux"]
+
+# _select_best_match scores per priority keyword found in the style name / Keywords / any other field
+MATCH_WEIGHTS = {"name": 10, "keywords": 3, "other": 1}
+
+# Concurrent fan-out: a batch waits at most this long; late or failing domains fall back to no results
+SEARCH_TIMEOUT = float(os.environ.get("UIPRO_SEARCH_TIMEOUT", "10"))
+# Batches over at least this much CSV data are scored on a process pool instead of threads
+PROCESS_POOL_MIN_BYTES = int(os.environ.get("UIPRO_PROCESS_POOL_MIN_MB", "32")) * 1024 * 1024
+# Bump whenever generate() output changes for the same inputs; invalidates the memo cache
+GENERATOR_VERSION = "1"
+# Memo cache of generated design systems (UIPRO_CACHE_MB=0 disables it)
+CACHE_DIR = Path(os.environ.get("UIPRO_CACHE_DIR", DATA_DIR.parent / ".cache"))
+CACHE_MAX_BYTES = int(float(os.environ.get("UIPRO_CACHE_MB", "16")) * 1024 * 1024)
+
+_PROCESS_POOL = None
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    """Process pool kept for the life of the process so workers keep their indexes warm."""
+    global _PROCESS_POOL
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _PROCESS_POOL
+
+
+def _domain_bytes(domain: str) -> int:
+    """Size of a domain's CSV (0 if missing)."""
+    filepath = DATA_DIR / CSV_CONFIG.get(domain, CSV_CONFIG["style"])["file"]
+    return filepath.stat().st_size if filepath.exists() else 0
+
+
+def _fallback_result(domain: str, query: str, reason: str) -> dict:
+    """Empty result for a domain that failed or timed out; callers then use their defaults."""
+    return {"domain": domain, "query": query, "count": 0, "results": [], "error": reason}
+
+
+def _fan_out(lookups: list, timeout: float) -> dict:
+    """
+    Run (domain, query, max_results) lookups concurrently under one deadline.
+
+    Lookups are grouped per domain so each domain is one task, however many
+    queries it scores. Cold loads are mostly file I/O, so threads are used by
+    default; large corpora are scored on a process pool. A domain that raises
+    or misses the deadline gets fallback results instead of holding up the others.
+    """
+    by_domain = {}
+    for domain, query, max_results in lookups:
+        by_domain.setdefault(domain, []).append((query, max_results))
+    use_processes = sum(_domain_bytes(domain) for domain in by_domain) >= PROCESS_POOL_MIN_BYTES
+    pool = _process_pool() if use_processes else ThreadPoolExecutor(max_workers=len(by_domain))
+    futures = {pool.submit(search_many, queries, domain): domain for domain, queries in by_domain.items()}
+    done, _ = wait(futures, timeout=timeout)
+
+    results = {}
+    for future, domain in futures.items():
+        queries = [query for query, _ in by_domain[domain]]
+        if future not in done:
+            future.cancel()
+            domain_results = [_fallback_result(domain, query, f"Search timed out after {timeout}s") for query in queries]
+        elif future.exception() is not None:
+            domain_results = [_fallback_result(domain, query, f"Search failed: {future.exception()}") for query in queries]
+        else:
+            domain_results = future.result()
+        results.update(((domain, query), result) for query, result in zip(queries, domain_results))
+    if not use_processes:
+        pool.shutdown(wait=False)
+    return results
+
+
+# ============ SEARCH PLAN ============
+class SearchPlan:
+    """
+    A set of (domain, query, max_results) lookups executed as one batch.
+
+    Lookups are deduplicated on (domain, query); when the same lookup is
+    requested with different max_results it runs once with the largest value
+    and smaller requests get a prefix of the ranking. Every distinct lookup
+    hits the shared index exactly once per plan.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._results = {}
+        self.lookups = 0
+
+    def add(self, domain: str, query: str, max_results: int) -> tuple:
+        """Register a lookup and return the key to fetch its result with."""
+        key = (domain, query)
+        if self._results.get(key, (0, None))[0] < max_results:
+            self._pending[key] = max(self._pending.get(key, 0), max_results)
+        return (domain, query, max_results)
+
+    def execute(self, timeout: float = None) -> "SearchPlan":
+        """Run every pending lookup once, concurrently when there are several."""
+        pending, self._pending = self._pending, {}
+        domains = {domain for domain, _ in pending}
+        if len(domains) == 1:
+            lookups = [(query, max_results) for (_, query), max_results in pending.items()]
+            results = dict(zip(pending, search_many(lookups, domains.pop())))
+        elif pending:
+            lookups = [(domain, query, max_results) for (domain, query), max_results in pending.items()]
+            results = _fan_out(lookups, SEARCH_TIMEOUT if timeout is None else timeout)
+        else:
+            results = {}
+        for key, result in results.items():
+            self._results[key] = (pending[key], result)
+        self.lookups += len(results)
+        return self
+
+    def get(self, domain: str, query: str, max_results: int) -> dict:
+        """Result of an executed lookup, trimmed to max_results."""
+        result = dict(self._results[(domain, query)][1])
+        if "results" in result:
+            result["results"] = result["results"][:max_results]
+            result["count"] = len(result["results"])
+        return result
+
 
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
     """Generates design system recommendations from aggregated searches."""
 
-    def __init__(self):
+    def __init__(self, match_weights: dict = None):
+        """match_weights overrides MATCH_WEIGHTS ("name", "keywords", "other") for style selection."""
+        self.match_weights = {**MATCH_WEIGHTS, **(match_weights or {})}
         self.reasoning_data = self._load_reasoning()
+        self._index_reasoning()
 
     def _load_reasoning(self) -> list:
         """Load reasoning rules from CSV."""
@@ -48,48 +186,95 @@ class DesignSystemGenerator:
         with open(filepath, 'r', encoding='utf-8') as f:
             return list(csv.DictReader(f))
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+    def _index_reasoning(self):
+        """Build reasoning lookup structures and parse every rule once."""
+        self._rule_exact = {}       # normalized UI_Category -> first rule
+        names, keywords = {}, {}    # UI_Category / keyword -> first rule (fed to automata)
+        ui_cats, self._rule_starts = [], []  # rule names, and the offset of each in _rule_names
+        offset = 0
+        self._parsed_rules = []
+        for idx, rule in enumerate(self.reasoning_data):
+            ui_cat = rule.get("UI_Category", "").lower()
+            ui_cats.append(ui_cat)
+            self._rule_starts.append(offset)
+            offset += len(ui_cat) + 1
+            self._rule_exact.setdefault(ui_cat, idx)
+            names.setdefault(ui_cat, idx)
+            for kw in ui_cat.replace("/", " ").replace("-", " ").split():
+                keywords.setdefault(kw, idx)
+            self._parsed_rules.append(self._parse_rule(rule))
+        self._empty_rule = names.get("")  # an empty UI_Category is "in" every category
+        # Every UI_Category in rule order, NUL-separated: the first hit of a category in it is the
+        # first rule whose name contains that category
+        self._rule_names = "\0".join(ui_cats)
+        self._name_matcher = PatternAutomaton(names.items())
+        self._keyword_matcher = PatternAutomaton(keywords.items())
+
+    def _parse_rule(self, rule: dict) -> dict:
+        """Reasoning fields of a rule, with Decision_Rules JSON parsed."""
+        decision_rules = {}
+        try:
+            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
+        except json.JSONDecodeError:
+            pass
+
+        return {
+            "pattern": rule.get("Recommended_Pattern", ""),
+            "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
+            "color_mood": rule.get("Color_Mood", ""),
+            "typography_mood": rule.get("Typography_Mood", ""),
+            "key_effects": rule.get("Key_Effects", ""),
+            "anti_patterns": rule.get("Anti_Patterns", ""),
+            "decision_rules": decision_rules,
+            "severity": rule.get("Severity", "MEDIUM")
+        }
+
+    def _multi_domain_search(self, query: str, style_priority: list = None, plan: SearchPlan = None) -> dict:
+        """Execute searches across multiple domains (lookups already in the plan are reused)."""
+        plan = plan if plan is not None else SearchPlan()
+        keys = {}
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                keys[domain] = plan.add(domain, combined_query, config["max_results"])
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                keys[domain] = plan.add(domain, query, config["max_results"])
+        plan.execute()
+        return {domain: plan.get(*key) for domain, key in keys.items()}
 
-    def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
+    def _find_reasoning_index(self, category: str):
+        """Index of the matching reasoning rule for a category, or None."""
         category_lower = category.lower()
 
         # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
+        if category_lower in self._rule_exact:
+            return self._rule_exact[category_lower]
+
+        # Try partial match (rule name inside category, or category inside rule name)
+        partial = [idx for _, _, idx in self._name_matcher.matches(category_lower)]
+        position = self._rule_names.find(category_lower) if self._rule_starts and "\0" not in category_lower else -1
+        if position >= 0:
+            partial.append(bisect_right(self._rule_starts, position) - 1)
+        if self._empty_rule is not None:
+            partial.append(self._empty_rule)
+        if partial:
+            return min(partial)
 
         # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
+        return min((idx for _, _, idx in self._keyword_matcher.matches(category_lower)), default=None)
 
-        return {}
+    def _find_reasoning_rule(self, category: str) -> dict:
+        """Find matching reasoning rule for a category."""
+        idx = self._find_reasoning_index(category)
+        return self.reasoning_data[idx] if idx is not None else {}
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
-        rule = self._find_reasoning_rule(category)
+        idx = self._find_reasoning_index(category)
 
-        if not rule:
+        if idx is None:
             return {
                 "pattern": "Hero + Features + CTA",
                 "style_priority": ["Minimalism", "Flat Design"],
@@ -101,23 +286,9 @@ class DesignSystemGenerator:
                 "severity": "MEDIUM"
             }
 
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
-
-        return {
-            "pattern": rule.get("Recommended_Pattern", ""),
-            "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
-            "color_mood": rule.get("Color_Mood", ""),
-            "typography_mood": rule.get("Typography_Mood", ""),
-            "key_effects": rule.get("Key_Effects", ""),
-            "anti_patterns": rule.get("Anti_Patterns", ""),
-            "decision_rules": decision_rules,
-            "severity": rule.get("Severity", "MEDIUM")
-        }
+        # Copy the pre-parsed rule so callers can't mutate the shared one
+        parsed = self._parsed_rules[idx]
+        return {**parsed, "style_priority": list(parsed["style_priority"]), "decision_rules": dict(parsed["decision_rules"])}
 
     def _select_best_match(self, results: list, priority_keywords: list) -> dict:
         """Select best matching result based on priority keywords."""
@@ -127,30 +298,32 @@ class DesignSystemGenerator:
         if not priority_keywords:
             return results[0]
 
+        # Search results carry views normalized at index time; other dicts are normalized here
+        views = [getattr(result, "view", None) or RowView(result) for result in results]
+        priorities = [normalize_text(priority) for priority in priority_keywords]
+
         # First: try exact style name match
-        for priority in priority_keywords:
-            priority_lower = priority.lower().strip()
-            for result in results:
-                style_name = result.get("Style Category", "").lower()
-                if priority_lower in style_name or style_name in priority_lower:
+        for priority in priorities:
+            for result, view in zip(results, views):
+                style_name = view.get("Style Category")
+                if priority in style_name or style_name in priority:
                     return result
 
         # Second: score by keyword match in all fields
+        weights = self.match_weights
         scored = []
-        for result in results:
-            result_str = str(result).lower()
+        for result, view in zip(results, views):
             score = 0
-            for kw in priority_keywords:
-                kw_lower = kw.lower().strip()
+            for kw in priorities:
                 # Higher score for style name match
-                if kw_lower in result.get("Style Category", "").lower():
-                    score += 10
+                if kw in view.get("Style Category"):
+                    score += weights["name"]
                 # Lower score for keyword field match
-                elif kw_lower in result.get("Keywords", "").lower():
-                    score += 3
+                elif kw in view.get("Keywords"):
+                    score += weights["keywords"]
                 # Even lower for other field matches
-                elif kw_lower in result_str:
-                    score += 1
+                elif view.contains(kw):
+                    score += weights["other"]
             scored.append((score, result))
 
         scored.sort(key=lambda x: x[0], reverse=True)
@@ -160,10 +333,15 @@ class DesignSystemGenerator:
         """Extract results list from search result dict."""
         return search_result.get("results", [])
 
-    def generate(self, query: str, project_name: str = None) -> dict:
+    def generate(self, query: str, project_name: str = None, plan: SearchPlan = None) -> dict:
         """Generate complete design system recommendation."""
-        # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        # Step 1: Batch every lookup that does not depend on the product category
+        plan = plan if plan is not None else SearchPlan()
+        for domain, config in SEARCH_CONFIG.items():
+            if domain != "style":
+                plan.add(domain, query, config["max_results"])
+        plan.execute()
+        product_result = plan.get("product", query, 1)
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -173,9 +351,8 @@ class DesignSystemGenerator:
         reasoning = self._apply_reasoning(category, {})
         style_priority = reasoning.get("style_priority", [])
 
-        # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
+        # Step 3: Multi-domain search with style priority hints (only style is still pending)
+        search_results = self._multi_domain_search(query, style_priority, plan)
 
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
@@ -236,231 +413,757 @@ class DesignSystemGenerator:
         }
 
 
-# ============ OUTPUT FORMATTERS ============
+# ============ WARM GENERATOR ============
+_GENERATOR = None
+_GENERATOR_FINGERPRINT = None
+_GENERATOR_LOCK = threading.Lock()
+
+
+def _file_fingerprint(filename: str):
+    """Size + mtime of a data CSV (None if missing)."""
+    filepath = DATA_DIR / filename
+    if not filepath.exists():
+        return None
+    stat = filepath.stat()
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _reasoning_fingerprint():
+    """Size + mtime of the reasoning CSV (None if missing)."""
+    return _file_fingerprint(REASONING_FILE)
+
+
+def get_generator() -> DesignSystemGenerator:
+    """
+    Process-wide DesignSystemGenerator, rebuilt when ui-reasoning.csv changes.
+
+    A replacement is fully built before it is swapped in, so callers holding
+    the previous generator keep working with a consistent rule set.
+    """
+    global _GENERATOR, _GENERATOR_FINGERPRINT
+    fingerprint = _reasoning_fingerprint()
+    generator = _GENERATOR
+    if generator is not None and fingerprint == _GENERATOR_FINGERPRINT:
+        return generator
+    with _GENERATOR_LOCK:
+        if _GENERATOR is None or fingerprint != _GENERATOR_FINGERPRINT:
+            _GENERATOR = _from_snapshot("generator", fingerprint) or DesignSystemGenerator()
+            _GENERATOR_FINGERPRINT = fingerprint
+        return _GENERATOR
+
+
+def warm(domains: list = None) -> DesignSystemGenerator:
+    """
+    Preload reasoning rules and the indexes used by design system generation.
+
+    Hosts rendering many design systems in one process call this once at
+    startup. Searches reload an index automatically when its CSV changes,
+    and get_generator() does the same for the reasoning rules.
+    """
+    generator = get_generator()
+    preload(WARM_DOMAINS if domains is None else domains)
+    return generator
+
+
+# ============ MEMO CACHE ============
+def _data_fingerprint() -> str:
+    """Hash of name, size and mtime of every data CSV (search domains, stacks, reasoning)."""
+    digest = hashlib.sha256()
+    for filepath in sorted(DATA_DIR.rglob("*.csv")):
+        stat = filepath.stat()
+        digest.update(f"{filepath.relative_to(DATA_DIR)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def cache_key(query: str, project_name: str = None) -> str:
+    """Memo key: (normalized query, project name, data fingerprint, generator version)."""
+    parts = [" ".join(query.lower().split()), project_name or "", _data_fingerprint(), GENERATOR_VERSION]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str):
+    """Stored design system for key, or None; a hit refreshes the entry's LRU stamp."""
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            design_system = json.load(f)
+        os.utime(path)
+        return design_system
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_put(key: str, design_system: dict):
+    """Atomically store a design system, then evict least recently used entries over CACHE_MAX_BYTES."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _atomic_write(CACHE_DIR / f"{key}.json", json.dumps(design_system, ensure_ascii=False))
+
+        entries = []
+        for path in CACHE_DIR.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= CACHE_MAX_BYTES:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+    except OSError:
+        pass  # the cache is an optimization; a read-only or full disk must not fail generation
+
+
+def generate_cached(query: str, project_name: str = None, plan: SearchPlan = None,
+                    use_cache: bool = True) -> dict:
+    """
+    DesignSystemGenerator.generate() memoized on disk.
+
+    generate() is a pure function of the query, the project name and the data
+    files, so a hit returns the stored dict without running any searches.
+    Entries are keyed by cache_key() and evicted least recently used first.
+    """
+    return _generate_cached(query, project_name, plan, use_cache)[0]
+
+
+def _generate_cached(query: str, project_name: str = None, plan: SearchPlan = None,
+                     use_cache: bool = True) -> tuple:
+    """generate_cached(), plus whether the memo cache answered."""
+    if not use_cache or CACHE_MAX_BYTES <= 0:
+        return get_generator().generate(query, project_name, plan), False
+    key = cache_key(query, project_name)
+    design_system = _cache_get(key)
+    if design_system is not None:
+        return design_system, True
+    design_system = get_generator().generate(query, project_name, plan)
+    _cache_put(key, design_system)
+    return design_system, False
+
+
+# ============ RENDER LAYER ============
 BOX_WIDTH = 90  # Wider box for more content
+RENDER_FORMATS = ("ascii", "markdown", "master", "page", "tokens_json", "tokens_css")
 
-def format_ascii_box(design_system: dict) -> str:
-    """Format design system as ASCII box with emojis (MCP-style)."""
-    project = design_system.get("project_name", "PROJECT")
-    pattern = design_system.get("pattern", {})
-    style = design_system.get("style", {})
-    colors = design_system.get("colors", {})
-    typography = design_system.get("typography", {})
-    effects = design_system.get("key_effects", "")
-    anti_patterns = design_system.get("anti_patterns", "")
-
-    def wrap_text(text: str, prefix: str, width: int) -> list:
-        """Wrap long text into multiple lines."""
-        if not text:
-            return []
-        words = text.split()
-        lines = []
-        current_line = prefix
-        for word in words:
-            if len(current_line) + len(word) + 1 <= width - 2:
-                current_line += (" " if current_line != prefix else "") + word
-            else:
-                if current_line != prefix:
-                    lines.append(current_line)
-                current_line = prefix + word
-        if current_line != prefix:
-            lines.append(current_line)
-        return lines
-
-    # Build sections from pattern
-    sections = pattern.get("sections", "").split(">")
-    sections = [s.strip() for s in sections if s.strip()]
-
-    # Build output lines
+# Token values behind the Spacing Variables / Shadow Depths tables of MASTER.md
+SPACING_TOKENS = [("xs", "4px"), ("sm", "8px"), ("md", "16px"), ("lg", "24px"),
+                  ("xl", "32px"), ("2xl", "48px"), ("3xl", "64px")]
+SHADOW_TOKENS = [("sm", "0 1px 2px rgba(0,0,0,0.05)"), ("md", "0 4px 6px rgba(0,0,0,0.1)"),
+                 ("lg", "0 10px 15px rgba(0,0,0,0.1)"), ("xl", "0 20px 25px rgba(0,0,0,0.15)")]
+
+
+class DesignSystemModel:
+    """
+    Section model of a design system, built once per render pass.
+
+    Every renderer reads from the model instead of walking the dict itself:
+    defaults are resolved and derived lists (landing sections, anti-patterns)
+    are split once, however many formats are emitted.
+    """
+
+    def __init__(self, design_system: dict):
+        self.data = design_system
+        self.project = design_system.get("project_name", "PROJECT")
+        self.category = design_system.get("category", "General")
+        self.pattern = design_system.get("pattern", {})
+        self.style = design_system.get("style", {})
+        self.colors = design_system.get("colors", {})
+        self.typography = design_system.get("typography", {})
+        self.effects = design_system.get("key_effects", "")
+        self.anti_patterns = design_system.get("anti_patterns", "")
+        self.sections = [s.strip() for s in self.pattern.get("sections", "").split(">") if s.strip()]
+        self.anti_list = [a.strip() for a in self.anti_patterns.split("+") if a.strip()]
+        self._tokens = None
+
+    @property
+    def tokens(self) -> dict:
+        """Design tokens (colors, fonts, effects, spacing, shadows) plus their stable hash."""
+        if self._tokens is None:
+            colors, typography = self.colors, self.typography
+            tokens = {
+                "project": self.project,
+                "category": self.category,
+                "style": self.style.get("name", "Minimalism"),
+                "colors": {
+                    "primary": colors.get("primary", "#2563EB"),
+                    "secondary": colors.get("secondary", "#3B82F6"),
+                    "cta": colors.get("cta", "#F97316"),
+                    "background": colors.get("background", "#F8FAFC"),
+                    "text": colors.get("text", "#1E293B")
+                },
+                "fonts": {
+                    "heading": typography.get("heading", "Inter"),
+                    "body": typography.get("body", "Inter"),
+                    "google_fonts_url": typography.get("google_fonts_url", ""),
+                    "css_import": typography.get("css_import", "")
+                },
+                "effects": self.effects,
+                "spacing": dict(SPACING_TOKENS),
+                "shadows": dict(SHADOW_TOKENS)
+            }
+            canonical = json.dumps(tokens, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+            tokens["hash"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+            self._tokens = tokens
+        return self._tokens
+
+
+def _model(design_system) -> DesignSystemModel:
+    """Accept either a design system dict or an already built model."""
+    return design_system if isinstance(design_system, DesignSystemModel) else DesignSystemModel(design_system)
+
+
+def _lines(*lines: str) -> str:
+    """Precompile a static run of lines into one block."""
+    return "\n".join(lines)
+
+
+def _box(text: str) -> str:
+    return text.ljust(BOX_WIDTH) + "|"
+
+
+_BOX_RULE = "+" + "-" * (BOX_WIDTH - 1) + "+"
+_BOX_BLANK = "|" + " " * BOX_WIDTH + "|"
+
+
+@lru_cache(maxsize=4096)
+def _box_wrap(text: str, prefix: str = "|     ") -> tuple:
+    """Word-wrap text into boxed lines; memoized since the same fields recur across runs."""
+    if not text:
+        return ()
     lines = []
-    w = BOX_WIDTH - 1
+    current_line = prefix
+    for word in text.split():
+        if len(current_line) + len(word) + 1 <= BOX_WIDTH - 2:
+            current_line += (" " if current_line != prefix else "") + word
+        else:
+            if current_line != prefix:
+                lines.append(current_line)
+            current_line = prefix + word
+    if current_line != prefix:
+        lines.append(current_line)
+    return tuple(_box(line) for line in lines)
+
 
-    lines.append("+" + "-" * w + "+")
-    lines.append(f"|  TARGET: {project} - RECOMMENDED DESIGN SYSTEM".ljust(BOX_WIDTH) + "|")
-    lines.append("+" + "-" * w + "+")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+_ASCII_CHECKLIST = _lines(
+    _box("|  PRE-DELIVERY CHECKLIST:"),
+    *(_box(f"|     {item}") for item in [
+        "[ ] No emojis as icons (use SVG: Heroicons/Lucide)",
+        "[ ] cursor-pointer on all clickable elements",
+        "[ ] Hover states with smooth transitions (150-300ms)",
+        "[ ] Light mode: text contrast 4.5:1 minimum",
+        "[ ] Focus states visible for keyboard nav",
+        "[ ] prefers-reduced-motion respected",
+        "[ ] Responsive: 375px, 768px, 1024px, 1440px"
+    ]),
+    _BOX_BLANK,
+    _BOX_RULE
+)
+
+
+def _render_ascii(m: DesignSystemModel, **context):
+    """ASCII box with emojis (MCP-style)."""
+    pattern, style, colors, typography = m.pattern, m.style, m.colors, m.typography
+    yield _BOX_RULE
+    yield _box(f"|  TARGET: {m.project} - RECOMMENDED DESIGN SYSTEM")
+    yield _BOX_RULE
+    yield _BOX_BLANK
 
     # Pattern section
-    lines.append(f"|  PATTERN: {pattern.get('name', '')}".ljust(BOX_WIDTH) + "|")
+    yield _box(f"|  PATTERN: {pattern.get('name', '')}")
     if pattern.get('conversion'):
-        lines.append(f"|     Conversion: {pattern.get('conversion', '')}".ljust(BOX_WIDTH) + "|")
+        yield _box(f"|     Conversion: {pattern.get('conversion', '')}")
     if pattern.get('cta_placement'):
-        lines.append(f"|     CTA: {pattern.get('cta_placement', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append("|     Sections:".ljust(BOX_WIDTH) + "|")
-    for i, section in enumerate(sections, 1):
-        lines.append(f"|       {i}. {section}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield _box(f"|     CTA: {pattern.get('cta_placement', '')}")
+    yield _box("|     Sections:")
+    for i, section in enumerate(m.sections, 1):
+        yield _box(f"|       {i}. {section}")
+    yield _BOX_BLANK
 
     # Style section
-    lines.append(f"|  STYLE: {style.get('name', '')}".ljust(BOX_WIDTH) + "|")
+    yield _box(f"|  STYLE: {style.get('name', '')}")
     if style.get("keywords"):
-        for line in wrap_text(f"Keywords: {style.get('keywords', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+        yield from _box_wrap(f"Keywords: {style.get('keywords', '')}")
     if style.get("best_for"):
-        for line in wrap_text(f"Best For: {style.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+        yield from _box_wrap(f"Best For: {style.get('best_for', '')}")
     if style.get("performance") or style.get("accessibility"):
-        perf_a11y = f"Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}"
-        lines.append(f"|     {perf_a11y}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield _box(f"|     Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}")
+    yield _BOX_BLANK
 
     # Colors section
-    lines.append("|  COLORS:".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Primary:    {colors.get('primary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Secondary:  {colors.get('secondary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     CTA:        {colors.get('cta', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Background: {colors.get('background', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Text:       {colors.get('text', '')}".ljust(BOX_WIDTH) + "|")
+    yield _box("|  COLORS:")
+    yield _box(f"|     Primary:    {colors.get('primary', '')}")
+    yield _box(f"|     Secondary:  {colors.get('secondary', '')}")
+    yield _box(f"|     CTA:        {colors.get('cta', '')}")
+    yield _box(f"|     Background: {colors.get('background', '')}")
+    yield _box(f"|     Text:       {colors.get('text', '')}")
     if colors.get("notes"):
-        for line in wrap_text(f"Notes: {colors.get('notes', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield from _box_wrap(f"Notes: {colors.get('notes', '')}")
+    yield _BOX_BLANK
 
     # Typography section
-    lines.append(f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}".ljust(BOX_WIDTH) + "|")
+    yield _box(f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}")
     if typography.get("mood"):
-        for line in wrap_text(f"Mood: {typography.get('mood', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+        yield from _box_wrap(f"Mood: {typography.get('mood', '')}")
     if typography.get("best_for"):
-        for line in wrap_text(f"Best For: {typography.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
+        yield from _box_wrap(f"Best For: {typography.get('best_for', '')}")
     if typography.get("google_fonts_url"):
-        lines.append(f"|     Google Fonts: {typography.get('google_fonts_url', '')}".ljust(BOX_WIDTH) + "|")
+        yield _box(f"|     Google Fonts: {typography.get('google_fonts_url', '')}")
     if typography.get("css_import"):
-        lines.append(f"|     CSS Import: {typography.get('css_import', '')[:70]}...".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+        yield _box(f"|     CSS Import: {typography.get('css_import', '')[:70]}...")
+    yield _BOX_BLANK
 
     # Key Effects section
-    if effects:
-        lines.append("|  KEY EFFECTS:".ljust(BOX_WIDTH) + "|")
-        for line in wrap_text(effects, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
+    if m.effects:
+        yield _box("|  KEY EFFECTS:")
+        yield from _box_wrap(m.effects)
+        yield _BOX_BLANK
 
     # Anti-patterns section
-    if anti_patterns:
-        lines.append("|  AVOID (Anti-patterns):".ljust(BOX_WIDTH) + "|")
-        for line in wrap_text(anti_patterns, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
+    if m.anti_patterns:
+        yield _box("|  AVOID (Anti-patterns):")
+        yield from _box_wrap(m.anti_patterns)
+        yield _BOX_BLANK
 
     # Pre-Delivery Checklist section
-    lines.append("|  PRE-DELIVERY CHECKLIST:".ljust(BOX_WIDTH) + "|")
-    checklist_items = [
-        "[ ] No emojis as icons (use SVG: Heroicons/Lucide)",
-        "[ ] cursor-pointer on all clickable elements",
-        "[ ] Hover states with smooth transitions (150-300ms)",
-        "[ ] Light mode: text contrast 4.5:1 minimum",
-        "[ ] Focus states visible for keyboard nav",
-        "[ ] prefers-reduced-motion respected",
-        "[ ] Responsive: 375px, 768px, 1024px, 1440px"
-    ]
-    for item in checklist_items:
-        lines.append(f"|     {item}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+    yield _ASCII_CHECKLIST
 
-    lines.append("+" + "-" * w + "+")
 
-    return "\n".join(lines)
+_MARKDOWN_CHECKLIST = _lines(
+    "### Pre-Delivery Checklist",
+    "- [ ] No emojis as icons (use SVG: Heroicons/Lucide)",
+    "- [ ] cursor-pointer on all clickable elements",
+    "- [ ] Hover states with smooth transitions (150-300ms)",
+    "- [ ] Light mode: text contrast 4.5:1 minimum",
+    "- [ ] Focus states visible for keyboard nav",
+    "- [ ] prefers-reduced-motion respected",
+    "- [ ] Responsive: 375px, 768px, 1024px, 1440px",
+    ""
+)
 
 
-def format_markdown(design_system: dict) -> str:
-    """Format design system as markdown."""
-    project = design_system.get("project_name", "PROJECT")
-    pattern = design_system.get("pattern", {})
-    style = design_system.get("style", {})
-    colors = design_system.get("colors", {})
-    typography = design_system.get("typography", {})
-    effects = design_system.get("key_effects", "")
-    anti_patterns = design_system.get("anti_patterns", "")
-
-    lines = []
-    lines.append(f"## Design System: {project}")
-    lines.append("")
+def _render_markdown(m: DesignSystemModel, **context):
+    """Compact markdown summary."""
+    pattern, style, colors, typography = m.pattern, m.style, m.colors, m.typography
+    yield f"## Design System: {m.project}"
+    yield ""
 
     # Pattern section
-    lines.append("### Pattern")
-    lines.append(f"- **Name:** {pattern.get('name', '')}")
+    yield "### Pattern"
+    yield f"- **Name:** {pattern.get('name', '')}"
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Focus:** {pattern.get('conversion', '')}")
+        yield f"- **Conversion Focus:** {pattern.get('conversion', '')}"
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
+        yield f"- **CTA Placement:** {pattern.get('cta_placement', '')}"
     if pattern.get('color_strategy'):
-        lines.append(f"- **Color Strategy:** {pattern.get('color_strategy', '')}")
-    lines.append(f"- **Sections:** {pattern.get('sections', '')}")
-    lines.append("")
+        yield f"- **Color Strategy:** {pattern.get('color_strategy', '')}"
+    yield f"- **Sections:** {pattern.get('sections', '')}"
+    yield ""
 
     # Style section
-    lines.append("### Style")
-    lines.append(f"- **Name:** {style.get('name', '')}")
+    yield "### Style"
+    yield f"- **Name:** {style.get('name', '')}"
     if style.get('keywords'):
-        lines.append(f"- **Keywords:** {style.get('keywords', '')}")
+        yield f"- **Keywords:** {style.get('keywords', '')}"
     if style.get('best_for'):
-        lines.append(f"- **Best For:** {style.get('best_for', '')}")
+        yield f"- **Best For:** {style.get('best_for', '')}"
     if style.get('performance') or style.get('accessibility'):
-        lines.append(f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}")
-    lines.append("")
+        yield f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}"
+    yield ""
 
     # Colors section
-    lines.append("### Colors")
-    lines.append(f"| Role | Hex |")
-    lines.append(f"|------|-----|")
-    lines.append(f"| Primary | {colors.get('primary', '')} |")
-    lines.append(f"| Secondary | {colors.get('secondary', '')} |")
-    lines.append(f"| CTA | {colors.get('cta', '')} |")
-    lines.append(f"| Background | {colors.get('background', '')} |")
-    lines.append(f"| Text | {colors.get('text', '')} |")
+    yield "### Colors\n| Role | Hex |\n|------|-----|"
+    yield f"| Primary | {colors.get('primary', '')} |"
+    yield f"| Secondary | {colors.get('secondary', '')} |"
+    yield f"| CTA | {colors.get('cta', '')} |"
+    yield f"| Background | {colors.get('background', '')} |"
+    yield f"| Text | {colors.get('text', '')} |"
     if colors.get("notes"):
-        lines.append(f"\n*Notes: {colors.get('notes', '')}*")
-    lines.append("")
+        yield f"\n*Notes: {colors.get('notes', '')}*"
+    yield ""
 
     # Typography section
-    lines.append("### Typography")
-    lines.append(f"- **Heading:** {typography.get('heading', '')}")
-    lines.append(f"- **Body:** {typography.get('body', '')}")
+    yield "### Typography"
+    yield f"- **Heading:** {typography.get('heading', '')}"
+    yield f"- **Body:** {typography.get('body', '')}"
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        yield f"- **Mood:** {typography.get('mood', '')}"
     if typography.get("best_for"):
-        lines.append(f"- **Best For:** {typography.get('best_for', '')}")
+        yield f"- **Best For:** {typography.get('best_for', '')}"
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** {typography.get('google_fonts_url', '')}")
+        yield f"- **Google Fonts:** {typography.get('google_fonts_url', '')}"
     if typography.get("css_import"):
-        lines.append(f"- **CSS Import:**")
-        lines.append(f"```css")
-        lines.append(f"{typography.get('css_import', '')}")
-        lines.append(f"```")
-    lines.append("")
+        yield f"- **CSS Import:**\n```css\n{typography.get('css_import', '')}\n```"
+    yield ""
 
     # Key Effects section
-    if effects:
-        lines.append("### Key Effects")
-        lines.append(f"{effects}")
-        lines.append("")
+    if m.effects:
+        yield f"### Key Effects\n{m.effects}\n"
 
     # Anti-patterns section
-    if anti_patterns:
-        lines.append("### Avoid (Anti-patterns)")
-        newline_bullet = '\n- '
-        lines.append(f"- {anti_patterns.replace(' + ', newline_bullet)}")
-        lines.append("")
+    if m.anti_patterns:
+        yield "### Avoid (Anti-patterns)"
+        yield "- " + m.anti_patterns.replace(" + ", "\n- ")
+        yield ""
 
     # Pre-Delivery Checklist section
-    lines.append("### Pre-Delivery Checklist")
-    lines.append("- [ ] No emojis as icons (use SVG: Heroicons/Lucide)")
-    lines.append("- [ ] cursor-pointer on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard nav")
-    lines.append("- [ ] prefers-reduced-motion respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("")
+    yield _MARKDOWN_CHECKLIST
+
+
+_MASTER_HEADER = _lines(
+    "# Design System Master File",
+    "",
+    "> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.",
+    "> If that file exists, its rules **override** this Master file.",
+    "> If not, strictly follow the rules below.",
+    "",
+    "---",
+    ""
+)
+
+_MASTER_SPACING_SHADOWS = _lines(
+    "### Spacing Variables",
+    "",
+    "| Token | Value | Usage |",
+    "|-------|-------|-------|",
+    "| `--space-xs` | `4px` / `0.25rem` | Tight gaps |",
+    "| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |",
+    "| `--space-md` | `16px` / `1rem` | Standard padding |",
+    "| `--space-lg` | `24px` / `1.5rem` | Section padding |",
+    "| `--space-xl` | `32px` / `2rem` | Large gaps |",
+    "| `--space-2xl` | `48px` / `3rem` | Section margins |",
+    "| `--space-3xl` | `64px` / `4rem` | Hero padding |",
+    "",
+    "### Shadow Depths",
+    "",
+    "| Level | Value | Usage |",
+    "|-------|-------|-------|",
+    "| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |",
+    "| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |",
+    "| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |",
+    "| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |",
+    "",
+    "---",
+    "",
+    "## Component Specs",
+    ""
+)
+
+# Component specs; {primary}, {cta} and {background} are filled from the palette
+_MASTER_COMPONENTS = _lines(
+    "### Buttons",
+    "",
+    "```css",
+    "/* Primary Button */",
+    ".btn-primary {{",
+    "  background: {cta};",
+    "  color: white;",
+    "  padding: 12px 24px;",
+    "  border-radius: 8px;",
+    "  font-weight: 600;",
+    "  transition: all 200ms ease;",
+    "  cursor: pointer;",
+    "}}",
+    "",
+    ".btn-primary:hover {{",
+    "  opacity: 0.9;",
+    "  transform: translateY(-1px);",
+    "}}",
+    "",
+    "/* Secondary Button */",
+    ".btn-secondary {{",
+    "  background: transparent;",
+    "  color: {primary};",
+    "  border: 2px solid {primary};",
+    "  padding: 12px 24px;",
+    "  border-radius: 8px;",
+    "  font-weight: 600;",
+    "  transition: all 200ms ease;",
+    "  cursor: pointer;",
+    "}}",
+    "```",
+    "",
+    "### Cards",
+    "",
+    "```css",
+    ".card {{",
+    "  background: {background};",
+    "  border-radius: 12px;",
+    "  padding: 24px;",
+    "  box-shadow: var(--shadow-md);",
+    "  transition: all 200ms ease;",
+    "  cursor: pointer;",
+    "}}",
+    "",
+    ".card:hover {{",
+    "  box-shadow: var(--shadow-lg);",
+    "  transform: translateY(-2px);",
+    "}}",
+    "```",
+    "",
+    "### Inputs",
+    "",
+    "```css",
+    ".input {{",
+    "  padding: 12px 16px;",
+    "  border: 1px solid #E2E8F0;",
+    "  border-radius: 8px;",
+    "  font-size: 16px;",
+    "  transition: border-color 200ms ease;",
+    "}}",
+    "",
+    ".input:focus {{",
+    "  border-color: {primary};",
+    "  outline: none;",
+    "  box-shadow: 0 0 0 3px {primary}20;",
+    "}}",
+    "```",
+    "",
+    "### Modals",
+    "",
+    "```css",
+    ".modal-overlay {{",
+    "  background: rgba(0, 0, 0, 0.5);",
+    "  backdrop-filter: blur(4px);",
+    "}}",
+    "",
+    ".modal {{",
+    "  background: white;",
+    "  border-radius: 16px;",
+    "  padding: 32px;",
+    "  box-shadow: var(--shadow-xl);",
+    "  max-width: 500px;",
+    "  width: 90%;",
+    "}}",
+    "```",
+    "",
+    "---",
+    "",
+    "## Style Guidelines",
+    ""
+)
+
+_MASTER_FOOTER = _lines(
+    "",
+    "### Additional Forbidden Patterns",
+    "",
+    "- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)",
+    "- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer",
+    "- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout",
+    "- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio",
+    "- ❌ **Instant state changes** — Always use transitions (150-300ms)",
+    "- ❌ **Invisible focus states** — Focus states must be visible for a11y",
+    "",
+    "---",
+    "",
+    "## Pre-Delivery Checklist",
+    "",
+    "Before delivering any UI code, verify:",
+    "",
+    "- [ ] No emojis used as icons (use SVG instead)",
+    "- [ ] All icons from consistent icon set (Heroicons/Lucide)",
+    "- [ ] `cursor-pointer` on all clickable elements",
+    "- [ ] Hover states with smooth transitions (150-300ms)",
+    "- [ ] Light mode: text contrast 4.5:1 minimum",
+    "- [ ] Focus states visible for keyboard navigation",
+    "- [ ] `prefers-reduced-motion` respected",
+    "- [ ] Responsive: 375px, 768px, 1024px, 1440px",
+    "- [ ] No content hidden behind fixed navbars",
+    "- [ ] No horizontal scroll on mobile",
+    ""
+)
+
+
+def _render_master(m: DesignSystemModel, **context):
+    """MASTER.md with hierarchical override logic."""
+    pattern, style, colors, typography = m.pattern, m.style, m.colors, m.typography
+    primary = colors.get('primary', '#2563EB')
 
-    return "\n".join(lines)
+    # Logic header
+    yield _MASTER_HEADER
+    yield f"**Project:** {m.project}"
+    yield f"**Generator:** ui-ux-pro-max v{GENERATOR_VERSION}"
+    yield f"**Category:** {m.category}"
+    yield "\n---\n"
+
+    # Global Rules section: color palette
+    yield "## Global Rules\n\n### Color Palette\n\n| Role | Hex | CSS Variable |\n|------|-----|--------------|"
+    yield f"| Primary | `{primary}` | `--color-primary` |"
+    yield f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |"
+    yield f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |"
+    yield f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |"
+    yield f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |"
+    yield ""
+    if colors.get("notes"):
+        yield f"**Color Notes:** {colors.get('notes', '')}\n"
+
+    # Typography
+    yield "### Typography\n"
+    yield f"- **Heading Font:** {typography.get('heading', 'Inter')}"
+    yield f"- **Body Font:** {typography.get('body', 'Inter')}"
+    if typography.get("mood"):
+        yield f"- **Mood:** {typography.get('mood', '')}"
+    if typography.get("google_fonts_url"):
+        yield f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})"
+    yield ""
+    if typography.get("css_import"):
+        yield f"**CSS Import:**\n```css\n{typography.get('css_import', '')}\n```\n"
+
+    # Spacing, shadows and component specs
+    yield _MASTER_SPACING_SHADOWS
+    yield _MASTER_COMPONENTS.format(primary=primary, cta=colors.get('cta', '#F97316'),
+                                    background=colors.get('background', '#FFFFFF'))
+
+    # Style section
+    yield f"**Style:** {style.get('name', 'Minimalism')}\n"
+    if style.get("keywords"):
+        yield f"**Keywords:** {style.get('keywords', '')}\n"
+    if style.get("best_for"):
+        yield f"**Best For:** {style.get('best_for', '')}\n"
+    if m.effects:
+        yield f"**Key Effects:** {m.effects}\n"
+
+    # Layout Pattern
+    yield "### Page Pattern\n"
+    yield f"**Pattern Name:** {pattern.get('name', '')}\n"
+    if pattern.get('conversion'):
+        yield f"- **Conversion Strategy:** {pattern.get('conversion', '')}"
+    if pattern.get('cta_placement'):
+        yield f"- **CTA Placement:** {pattern.get('cta_placement', '')}"
+    yield f"- **Section Order:** {pattern.get('sections', '')}"
+    yield ""
+
+    # Anti-Patterns section
+    yield "---\n\n## Anti-Patterns (Do NOT Use)\n"
+    for anti in m.anti_list:
+        yield f"- ❌ {anti}"
+    yield _MASTER_FOOTER
+
+
+_PAGE_NOTICE = _lines(
+    "",
+    "> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).",
+    "> Only deviations from the Master are documented here. For all other rules, refer to the Master.",
+    "",
+    "---",
+    "",
+    "## Page-Specific Rules",
+    ""
+)
+
+
+def _page_items(title: str, items, empty: str, heading: str = "###"):
+    """One override subsection: key/value dict or plain list, with a fallback line."""
+    yield f"{heading} {title}\n"
+    if not items:
+        yield f"- {empty}"
+    elif isinstance(items, dict):
+        for key, value in items.items():
+            yield f"- **{key}:** {value}"
+    else:
+        for item in items:
+            yield f"- {item}"
+    yield ""
+
+
+def _render_page(m: DesignSystemModel, page_name: str = "", overrides: dict = None, **context):
+    """Page-specific override file; overrides come from _generate_intelligent_overrides."""
+    overrides = overrides or {}
+    page_title = page_name.replace("-", " ").replace("_", " ").title()
+    yield f"# {page_title} Page Overrides\n"
+    yield f"> **PROJECT:** {m.project}"
+    yield f"> **Generator:** ui-ux-pro-max v{GENERATOR_VERSION}"
+    yield f"> **Page Type:** {overrides.get('page_type', 'General')}"
+    yield _PAGE_NOTICE
+    yield from _page_items("Layout Overrides", overrides.get("layout", {}), "No overrides — use Master layout")
+    yield from _page_items("Spacing Overrides", overrides.get("spacing", {}), "No overrides — use Master spacing")
+    yield from _page_items("Typography Overrides", overrides.get("typography", {}), "No overrides — use Master typography")
+    yield from _page_items("Color Overrides", overrides.get("colors", {}), "No overrides — use Master colors")
+    yield from _page_items("Component Overrides", overrides.get("components", []), "No overrides — use Master component specs")
+    yield "---\n"
+    yield from _page_items("Page-Specific Components", overrides.get("unique_components", []),
+                          "No unique components for this page", "##")
+    yield "---\n\n## Recommendations\n"
+    for rec in overrides.get("recommendations", []):
+        yield f"- {rec}"
+    yield ""
+
+
+def _render_tokens_json(m: DesignSystemModel, **context):
+    """tokens.json: the token dict with its hash, keys sorted so equal tokens give equal bytes."""
+    yield json.dumps(m.tokens, indent=2, sort_keys=True, ensure_ascii=False)
+    yield ""
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _render_tokens_css(m: DesignSystemModel, **context):
+    """tokens.css: the same tokens as custom properties on :root."""
+    tokens = m.tokens
+    yield f"/* {tokens['project']} design tokens - hash {tokens['hash']} (ui-ux-pro-max v{GENERATOR_VERSION}) */"
+    if tokens["fonts"]["css_import"]:
+        yield tokens["fonts"]["css_import"]  # @import must precede every other rule
+    yield ":root {"
+    yield f"  --tokens-hash: {_css_string(tokens['hash'])};"
+    for name, value in tokens["colors"].items():
+        yield f"  --color-{name}: {value};"
+    yield f"  --font-heading: {_css_string(tokens['fonts']['heading'])};"
+    yield f"  --font-body: {_css_string(tokens['fonts']['body'])};"
+    for name, value in tokens["spacing"].items():
+        yield f"  --space-{name}: {value};"
+    for name, value in tokens["shadows"].items():
+        yield f"  --shadow-{name}: {value};"
+    yield "}"
+    yield ""
+
+
+RENDERERS = {
+    "ascii": _render_ascii,
+    "markdown": _render_markdown,
+    "master": _render_master,
+    "page": _render_page,
+    "tokens_json": _render_tokens_json,
+    "tokens_css": _render_tokens_css
+}
+
+
+def render(design_system, formats=("ascii",), **context) -> dict:
+    """
+    Render several formats from one section model.
+
+    design_system is a dict or a DesignSystemModel; context is passed to the
+    renderers ("page" needs page_name and overrides). Returns format -> text.
+    """
+    model = _model(design_system)
+    return {fmt: "\n".join(RENDERERS[fmt](model, **context)) for fmt in formats}
+
+
+def render_to(handle, design_system, fmt: str = "markdown", **context) -> int:
+    """Stream one format to a writable text handle block by block; returns characters written."""
+    written = 0
+    separator = ""
+    for block in RENDERERS[fmt](_model(design_system), **context):
+        written += handle.write(separator + block)
+        separator = "\n"
+    return written
+
+
+def format_ascii_box(design_system: dict) -> str:
+    """Format design system as ASCII box with emojis (MCP-style)."""
+    return render(design_system, ["ascii"])["ascii"]
+
+
+def format_markdown(design_system: dict) -> str:
+    """Format design system as markdown."""
+    return render(design_system, ["markdown"])["markdown"]
 
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page=None, output_dir: str = None,
+                           use_cache: bool = True) -> str:
     """
     Main entry point for design system generation.
 
@@ -469,42 +1172,136 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         project_name: Optional project name for output header
         output_format: "ascii" (default) or "markdown"
         persist: If True, save design system to design-system/ folder
-        page: Optional page name for page-specific override file
+        page: Optional page name (or list of names) for page-specific override files
         output_dir: Optional output directory (defaults to current working directory)
+        use_cache: If False, bypass the on-disk memo cache
 
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    started = time.perf_counter()
+    plan = SearchPlan()
+    if persist:
+        for page_name in _page_list(page):
+            _plan_page_overrides(plan, page_name, query)
+    design_system, cache_hit = _generate_cached(query, project_name, plan, use_cache)
     
+    # One section model serves the persisted files and the returned output
+    model = DesignSystemModel(design_system)
+
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        persist_design_system(model, page, output_dir, query, plan)
 
-    if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+    fmt = "markdown" if output_format == "markdown" else "ascii"
+    output = render(model, [fmt])[fmt]
+    # A design system "has results" when the query matched a product category
+    telemetry.record("design_system", query, "design_system", time.perf_counter() - started, cache_hit,
+                     0 if design_system.get("category", "General") == "General" else 1)
+    return output
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+MANIFEST_FILE = ".manifest.json"
+
+
+def _atomic_write(path: Path, content: str):
+    """Write via a temp file in the same directory plus rename, so readers never see partial files."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _load_file_manifest(project_dir: Path) -> dict:
+    """{relative path: {"sha256", "size", "mtime_ns"}} recorded by the last persist into project_dir."""
+    try:
+        with open(project_dir / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _write_if_changed(path: Path, content: str, manifest: dict, project_dir: Path) -> bool:
+    """
+    Atomically write content unless path already holds it; returns True if written.
+
+    The manifest entry (hash, size and mtime of the file as last written)
+    answers the common unchanged case from a single stat; a file whose size or
+    mtime moved since, even by an edit of the same size, is re-hashed before
+    deciding.
+    """
+    rel = path.relative_to(project_dir).as_posix()
+    digest = _content_hash(content)
+    size = len(content.encode("utf-8"))
+    try:
+        stat = path.stat()
+    except OSError:
+        stat = None
+    recorded = manifest.get(rel)
+    if stat is None or stat.st_size != size:
+        unchanged = False
+    elif recorded == {"sha256": digest, "size": size, "mtime_ns": stat.st_mtime_ns}:
+        unchanged = True
+    else:
+        unchanged = hashlib.sha256(path.read_bytes()).hexdigest() == digest
+    if not unchanged:
+        _atomic_write(path, content)
+        stat = path.stat()
+    manifest[rel] = {"sha256": digest, "size": size, "mtime_ns": stat.st_mtime_ns}
+    return not unchanged
+
+
+def _page_list(page) -> list:
+    """Normalize a page argument (None, a name or a list of names) to a list of names."""
+    if not page:
+        return []
+    return [page] if isinstance(page, str) else list(page)
+
+
+def load_pages(path: str) -> list:
+    """Page names from a pages file: one per line, blank lines and # comments ignored."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def persist_design_system(design_system: dict, page=None, output_dir: str = None, page_query: str = None,
+                          plan: SearchPlan = None) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
     Args:
-        design_system: The generated design system dictionary
-        page: Optional page name for page-specific override file
+        design_system: The generated design system dictionary (or its DesignSystemModel)
+        page: Optional page name (or list of names) for page-specific override files
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        plan: Optional SearchPlan that already holds the page override lookups
     
+    MASTER.md, tokens.json and tokens.css are rendered from one section
+    model; the tokens files carry a stable hash for cache busting. The
+    lookups of every page are executed as one plan before any override is
+    rendered, so many pages cost about as much as one. Rendering is
+    deterministic, and a file is only rewritten (atomically) when its content
+    changed; design-system/<project>/.manifest.json records the hash of every
+    file persisted there.
+
     Returns:
-        dict with created file paths and status
+        dict with status, every target file path (created_files), the subset
+        actually written (written_files) and the tokens hash
     """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
     # Use project name for project-specific folder
-    project_name = design_system.get("project_name", "default")
+    model = _model(design_system)
+    project_name = model.data.get("project_name", "default")
     project_slug = project_name.lower().replace(' ', '-')
     
     design_system_dir = base_dir / "design-system" / project_slug
@@ -516,418 +1313,91 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     design_system_dir.mkdir(parents=True, exist_ok=True)
     pages_dir.mkdir(parents=True, exist_ok=True)
     
-    master_file = design_system_dir / "MASTER.md"
+    manifest = _load_file_manifest(design_system_dir)
+    before = dict(manifest)
+    written_files = []
     
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
+    # Generate and write MASTER.md plus the machine-readable tokens
+    outputs = render(model, ["master", "tokens_json", "tokens_css"])
+    for filename, fmt in [("MASTER.md", "master"), ("tokens.json", "tokens_json"), ("tokens.css", "tokens_css")]:
+        target = design_system_dir / filename
+        if _write_if_changed(target, outputs[fmt], manifest, design_system_dir):
+            written_files.append(str(target))
+        created_files.append(str(target))
     
-    # If page is specified, create page override file with intelligent content
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
+    # If pages are specified, create page override files with intelligent content
+    pages = _page_list(page)
+    plan = plan if plan is not None else SearchPlan()
+    for page_name in pages:
+        _plan_page_overrides(plan, page_name, page_query)
+    plan.execute()
+    for page_name in pages:
+        page_file = pages_dir / f"{page_name.lower().replace(' ', '-')}.md"
+        page_content = format_page_override_md(model, page_name, page_query, plan)
+        if _write_if_changed(page_file, page_content, manifest, design_system_dir):
+            written_files.append(str(page_file))
         created_files.append(str(page_file))
+
+    if manifest != before:
+        _atomic_write(design_system_dir / MANIFEST_FILE,
+                      json.dumps({"files": manifest}, indent=2, sort_keys=True) + "\n")
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": created_files,
+        "written_files": written_files,
+        "tokens_hash": model.tokens["hash"]
     }
 
 
 def format_master_md(design_system: dict) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
-    project = design_system.get("project_name", "PROJECT")
-    pattern = design_system.get("pattern", {})
-    style = design_system.get("style", {})
-    colors = design_system.get("colors", {})
-    typography = design_system.get("typography", {})
-    effects = design_system.get("key_effects", "")
-    anti_patterns = design_system.get("anti_patterns", "")
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    lines = []
-    
-    # Logic header
-    lines.append("# Design System Master File")
-    lines.append("")
-    lines.append("> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.")
-    lines.append("> If that file exists, its rules **override** this Master file.")
-    lines.append("> If not, strictly follow the rules below.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append(f"**Project:** {project}")
-    lines.append(f"**Generated:** {timestamp}")
-    lines.append(f"**Category:** {design_system.get('category', 'General')}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    
-    # Global Rules section
-    lines.append("## Global Rules")
-    lines.append("")
-    
-    # Color Palette
-    lines.append("### Color Palette")
-    lines.append("")
-    lines.append("| Role | Hex | CSS Variable |")
-    lines.append("|------|-----|--------------|")
-    lines.append(f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |")
-    lines.append(f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |")
-    lines.append(f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |")
-    lines.append(f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |")
-    lines.append(f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |")
-    lines.append("")
-    if colors.get("notes"):
-        lines.append(f"**Color Notes:** {colors.get('notes', '')}")
-        lines.append("")
-    
-    # Typography
-    lines.append("### Typography")
-    lines.append("")
-    lines.append(f"- **Heading Font:** {typography.get('heading', 'Inter')}")
-    lines.append(f"- **Body Font:** {typography.get('body', 'Inter')}")
-    if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
-    if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})")
-    lines.append("")
-    if typography.get("css_import"):
-        lines.append("**CSS Import:**")
-        lines.append("```css")
-        lines.append(typography.get("css_import", ""))
-        lines.append("```")
-        lines.append("")
-    
-    # Spacing Variables
-    lines.append("### Spacing Variables")
-    lines.append("")
-    lines.append("| Token | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--space-xs` | `4px` / `0.25rem` | Tight gaps |")
-    lines.append("| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |")
-    lines.append("| `--space-md` | `16px` / `1rem` | Standard padding |")
-    lines.append("| `--space-lg` | `24px` / `1.5rem` | Section padding |")
-    lines.append("| `--space-xl` | `32px` / `2rem` | Large gaps |")
-    lines.append("| `--space-2xl` | `48px` / `3rem` | Section margins |")
-    lines.append("| `--space-3xl` | `64px` / `4rem` | Hero padding |")
-    lines.append("")
-    
-    # Shadow Depths
-    lines.append("### Shadow Depths")
-    lines.append("")
-    lines.append("| Level | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |")
-    lines.append("| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |")
-    lines.append("| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |")
-    lines.append("| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |")
-    lines.append("")
-    
-    # Component Specs section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Component Specs")
-    lines.append("")
-    
-    # Buttons
-    lines.append("### Buttons")
-    lines.append("")
-    lines.append("```css")
-    lines.append("/* Primary Button */")
-    lines.append(".btn-primary {")
-    lines.append(f"  background: {colors.get('cta', '#F97316')};")
-    lines.append("  color: white;")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".btn-primary:hover {")
-    lines.append("  opacity: 0.9;")
-    lines.append("  transform: translateY(-1px);")
-    lines.append("}")
-    lines.append("")
-    lines.append("/* Secondary Button */")
-    lines.append(".btn-secondary {")
-    lines.append(f"  background: transparent;")
-    lines.append(f"  color: {colors.get('primary', '#2563EB')};")
-    lines.append(f"  border: 2px solid {colors.get('primary', '#2563EB')};")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Cards
-    lines.append("### Cards")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".card {")
-    lines.append(f"  background: {colors.get('background', '#FFFFFF')};")
-    lines.append("  border-radius: 12px;")
-    lines.append("  padding: 24px;")
-    lines.append("  box-shadow: var(--shadow-md);")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".card:hover {")
-    lines.append("  box-shadow: var(--shadow-lg);")
-    lines.append("  transform: translateY(-2px);")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Inputs
-    lines.append("### Inputs")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".input {")
-    lines.append("  padding: 12px 16px;")
-    lines.append("  border: 1px solid #E2E8F0;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-size: 16px;")
-    lines.append("  transition: border-color 200ms ease;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".input:focus {")
-    lines.append(f"  border-color: {colors.get('primary', '#2563EB')};")
-    lines.append("  outline: none;")
-    lines.append(f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Modals
-    lines.append("### Modals")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".modal-overlay {")
-    lines.append("  background: rgba(0, 0, 0, 0.5);")
-    lines.append("  backdrop-filter: blur(4px);")
-    lines.append("}")
-    lines.append("")
-    lines.append(".modal {")
-    lines.append("  background: white;")
-    lines.append("  border-radius: 16px;")
-    lines.append("  padding: 32px;")
-    lines.append("  box-shadow: var(--shadow-xl);")
-    lines.append("  max-width: 500px;")
-    lines.append("  width: 90%;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Style section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Style Guidelines")
-    lines.append("")
-    lines.append(f"**Style:** {style.get('name', 'Minimalism')}")
-    lines.append("")
-    if style.get("keywords"):
-        lines.append(f"**Keywords:** {style.get('keywords', '')}")
-        lines.append("")
-    if style.get("best_for"):
-        lines.append(f"**Best For:** {style.get('best_for', '')}")
-        lines.append("")
-    if effects:
-        lines.append(f"**Key Effects:** {effects}")
-        lines.append("")
-    
-    # Layout Pattern
-    lines.append("### Page Pattern")
-    lines.append("")
-    lines.append(f"**Pattern Name:** {pattern.get('name', '')}")
-    lines.append("")
-    if pattern.get('conversion'):
-        lines.append(f"- **Conversion Strategy:** {pattern.get('conversion', '')}")
-    if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
-    lines.append(f"- **Section Order:** {pattern.get('sections', '')}")
-    lines.append("")
-    
-    # Anti-Patterns section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Anti-Patterns (Do NOT Use)")
-    lines.append("")
-    if anti_patterns:
-        anti_list = [a.strip() for a in anti_patterns.split("+")]
-        for anti in anti_list:
-            if anti:
-                lines.append(f"- ❌ {anti}")
-    lines.append("")
-    lines.append("### Additional Forbidden Patterns")
-    lines.append("")
-    lines.append("- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)")
-    lines.append("- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer")
-    lines.append("- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout")
-    lines.append("- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio")
-    lines.append("- ❌ **Instant state changes** — Always use transitions (150-300ms)")
-    lines.append("- ❌ **Invisible focus states** — Focus states must be visible for a11y")
-    lines.append("")
-    
-    # Pre-Delivery Checklist
-    lines.append("---")
-    lines.append("")
-    lines.append("## Pre-Delivery Checklist")
-    lines.append("")
-    lines.append("Before delivering any UI code, verify:")
-    lines.append("")
-    lines.append("- [ ] No emojis used as icons (use SVG instead)")
-    lines.append("- [ ] All icons from consistent icon set (Heroicons/Lucide)")
-    lines.append("- [ ] `cursor-pointer` on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard navigation")
-    lines.append("- [ ] `prefers-reduced-motion` respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("- [ ] No content hidden behind fixed navbars")
-    lines.append("- [ ] No horizontal scroll on mobile")
-    lines.append("")
-    
-    return "\n".join(lines)
+    return render(design_system, ["master"])["master"]
 
 
-def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
+def format_page_override_md(design_system: dict, page_name: str, page_query: str = None, plan: SearchPlan = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
-    project = design_system.get("project_name", "PROJECT")
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    page_title = page_name.replace("-", " ").replace("_", " ").title()
-    
+    model = _model(design_system)
     # Detect page type and generate intelligent overrides
-    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
-    
-    lines = []
-    
-    lines.append(f"# {page_title} Page Overrides")
-    lines.append("")
-    lines.append(f"> **PROJECT:** {project}")
-    lines.append(f"> **Generated:** {timestamp}")
-    lines.append(f"> **Page Type:** {page_overrides.get('page_type', 'General')}")
-    lines.append("")
-    lines.append("> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).")
-    lines.append("> Only deviations from the Master are documented here. For all other rules, refer to the Master.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    
-    # Page-specific rules with actual content
-    lines.append("## Page-Specific Rules")
-    lines.append("")
-    
-    # Layout Overrides
-    lines.append("### Layout Overrides")
-    lines.append("")
-    layout = page_overrides.get("layout", {})
-    if layout:
-        for key, value in layout.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master layout")
-    lines.append("")
-    
-    # Spacing Overrides
-    lines.append("### Spacing Overrides")
-    lines.append("")
-    spacing = page_overrides.get("spacing", {})
-    if spacing:
-        for key, value in spacing.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master spacing")
-    lines.append("")
-    
-    # Typography Overrides
-    lines.append("### Typography Overrides")
-    lines.append("")
-    typography = page_overrides.get("typography", {})
-    if typography:
-        for key, value in typography.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master typography")
-    lines.append("")
-    
-    # Color Overrides
-    lines.append("### Color Overrides")
-    lines.append("")
-    colors = page_overrides.get("colors", {})
-    if colors:
-        for key, value in colors.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master colors")
-    lines.append("")
-    
-    # Component Overrides
-    lines.append("### Component Overrides")
-    lines.append("")
-    components = page_overrides.get("components", [])
-    if components:
-        for comp in components:
-            lines.append(f"- {comp}")
-    else:
-        lines.append("- No overrides — use Master component specs")
-    lines.append("")
-    
-    # Page-Specific Components
-    lines.append("---")
-    lines.append("")
-    lines.append("## Page-Specific Components")
-    lines.append("")
-    unique_components = page_overrides.get("unique_components", [])
-    if unique_components:
-        for comp in unique_components:
-            lines.append(f"- {comp}")
-    else:
-        lines.append("- No unique components for this page")
-    lines.append("")
-    
-    # Recommendations
-    lines.append("---")
-    lines.append("")
-    lines.append("## Recommendations")
-    lines.append("")
-    recommendations = page_overrides.get("recommendations", [])
-    if recommendations:
-        for rec in recommendations:
-            lines.append(f"- {rec}")
-    lines.append("")
-    
-    return "\n".join(lines)
+    page_overrides = _generate_intelligent_overrides(page_name, page_query, model.data, plan)
+    return render(model, ["page"], page_name=page_name, overrides=page_overrides)["page"]
+
+
+PAGE_SEARCH_CONFIG = {
+    "style": {"max_results": 1},
+    "ux": {"max_results": 3},
+    "landing": {"max_results": 1}
+}
+
+
+def _page_context(page_name: str, page_query: str) -> str:
+    """Combined search context for a page override."""
+    return f"{page_name.lower()} {(page_query or '').lower()}"
 
 
-def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
+def _plan_page_overrides(plan: SearchPlan, page_name: str, page_query: str) -> dict:
+    """Add a page's override lookups to a plan; returns domain -> lookup key."""
+    context = _page_context(page_name, page_query)
+    return {domain: plan.add(domain, context, config["max_results"]) for domain, config in PAGE_SEARCH_CONFIG.items()}
+
+
+def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict, plan: SearchPlan = None) -> dict:
     """
     Generate intelligent overrides based on page type using layered search.
     
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
-    page_lower = page_name.lower()
-    query_lower = (page_query or "").lower()
-    combined_context = f"{page_lower} {query_lower}"
+    combined_context = _page_context(page_name, page_query)
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    plan = plan if plan is not None else SearchPlan()
+    keys = _plan_page_overrides(plan, page_name, page_query)
+    plan.execute()
+    style_search = plan.get(*keys["style"])
+    ux_search = plan.get(*keys["ux"])
+    landing_search = plan.get(*keys["landing"])
     
     # Extract results from search response
     style_results = style_search.get("results", [])
@@ -1017,27 +1487,97 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     }
 
 
+# ============ PAGE TYPE CLASSIFIER ============
+_CAMEL_BOUNDARY = re.compile(r"([a-z0-9])([A-Z])")
+
+
+class PageTypeClassifier:
+    """
+    Weighted page type classifier compiled from page-types.csv.
+
+    Each row is a page type with comma-separated keywords, optionally
+    weighted as "keyword:2", and a row Weight multiplier. Every keyword of
+    every type is found in one Aho-Corasick pass. A keyword only counts when
+    it starts a word: a whole word scores its full weight, a prefix of a
+    longer word ("dashboard" in "dashboards") scores PREFIX_FACTOR of it.
+    Ties go to the type listed first in the file.
+    """
+
+    PREFIX_FACTOR = 0.5
+
+    def __init__(self, rows: list):
+        self.types = []
+        patterns = []
+        for row in rows:
+            page_type = (row.get("Page_Type") or "").strip()
+            if not page_type:
+                continue
+            rank = len(self.types)
+            self.types.append(page_type)
+            row_weight = float(row.get("Weight") or 1)
+            for item in (row.get("Keywords") or "").split(","):
+                keyword, _, weight = item.strip().lower().partition(":")
+                if keyword:
+                    patterns.append((keyword.strip(), (rank, row_weight * float(weight or 1))))
+        self._automaton = PatternAutomaton(patterns)
+
+    @classmethod
+    def from_csv(cls, filepath: Path = None) -> "PageTypeClassifier":
+        """Compile the classifier from a page types CSV (empty if missing)."""
+        filepath = filepath or DATA_DIR / PAGE_TYPES_FILE
+        if not filepath.exists():
+            return cls([])
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls(list(csv.DictReader(f)))
+
+    def scores(self, text: str) -> dict:
+        """Type rank -> summed keyword weight for text (route names, page names, queries)."""
+        text = _CAMEL_BOUNDARY.sub(r"\1 \2", text).lower()
+        scores = {}
+        for start, end, (rank, weight) in self._automaton.matches(text):
+            if start and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalnum():
+                weight *= self.PREFIX_FACTOR
+            scores[rank] = scores.get(rank, 0) + weight
+        return scores
+
+    def classify(self, text: str, top: int = 3) -> list:
+        """Best page types for text as [(page_type, confidence)], confidence summing to <= 1."""
+        scores = self.scores(text)
+        total = sum(scores.values())
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top]
+        return [(self.types[rank], round(score / total, 4)) for rank, score in ranked]
+
+    def classify_many(self, texts, top: int = 1) -> list:
+        """classify() over many texts, e.g. every route name of a frontend."""
+        return [self.classify(text, top) for text in texts]
+
+
+_PAGE_CLASSIFIER = None
+_PAGE_CLASSIFIER_FINGERPRINT = None
+
+
+def get_page_classifier() -> PageTypeClassifier:
+    """Process-wide PageTypeClassifier, recompiled when page-types.csv changes."""
+    global _PAGE_CLASSIFIER, _PAGE_CLASSIFIER_FINGERPRINT
+    fingerprint = _file_fingerprint(PAGE_TYPES_FILE)
+    if _PAGE_CLASSIFIER is None or fingerprint != _PAGE_CLASSIFIER_FINGERPRINT:
+        _PAGE_CLASSIFIER = _from_snapshot("page_classifier", fingerprint) or PageTypeClassifier.from_csv()
+        _PAGE_CLASSIFIER_FINGERPRINT = fingerprint
+    return _PAGE_CLASSIFIER
+
+
+def classify_page_type(text: str, top: int = 3) -> list:
+    """Top page types for a page/route name as [(page_type, confidence)]."""
+    return get_page_classifier().classify(text, top)
+
+
 def _detect_page_type(context: str, style_results: list) -> str:
     """Detect page type from context and search results."""
-    context_lower = context.lower()
-    
-    # Check for common page type patterns
-    page_patterns = [
-        (["dashboard", "admin", "analytics", "data", "metrics", "stats", "monitor", "overview"], "Dashboard / Data View"),
-        (["checkout", "payment", "cart", "purchase", "order", "billing"], "Checkout / Payment"),
-        (["settings", "profile", "account", "preferences", "config"], "Settings / Profile"),
-        (["landing", "marketing", "homepage", "hero", "home", "promo"], "Landing / Marketing"),
-        (["login", "signin", "signup", "register", "auth", "password"], "Authentication"),
-        (["pricing", "plans", "subscription", "tiers", "packages"], "Pricing / Plans"),
-        (["blog", "article", "post", "news", "content", "story"], "Blog / Article"),
-        (["product", "item", "detail", "pdp", "shop", "store"], "Product Detail"),
-        (["search", "results", "browse", "filter", "catalog", "list"], "Search Results"),
-        (["empty", "404", "error", "not found", "zero"], "Empty State"),
-    ]
-    
-    for keywords, page_type in page_patterns:
-        if any(kw in context_lower for kw in keywords):
-            return page_type
+    matches = classify_page_type(context, top=1)
+    if matches:
+        return matches[0][0]
     
     # Fallback: try to infer from style results
     if style_results:
@@ -1052,6 +1592,107 @@ def _detect_page_type(context: str, style_results: list) -> str:
     return "General"
 
 
+# ============ BATCH GENERATION ============
+def load_manifest(path: str) -> list:
+    """
+    Read a batch manifest into [{"project", "query", "pages"}] entries.
+
+    JSON: a list of objects (or {"projects": [...]}) with project (or
+    project_name/name), query and pages (list or "a; b" string).
+    CSV: columns project, query, pages (quote a field holding a comma).
+    A pages string is split on ";", "|" and "," like --page; the query is
+    never split, so "fintech, banking app" stays one entry.
+    """
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix.lower() == ".csv":
+            raw = list(csv.DictReader(f))
+        else:
+            raw = json.load(f)
+            if isinstance(raw, dict):
+                raw = raw.get("projects", [])
+
+    entries = []
+    for i, item in enumerate(raw, 1):
+        query = (item.get("query") or "").strip()
+        if not query:
+            raise ValueError(f"{path}: entry {i} has no query")
+        pages = item.get("pages") or []
+        if isinstance(pages, str):
+            pages = re.split(r"[;|,]", pages)
+        entries.append({
+            "project": (item.get("project") or item.get("project_name") or item.get("name") or "").strip() or None,
+            "query": query,
+            "pages": [p.strip() for p in pages if p and p.strip()]
+        })
+    return entries
+
+
+def _batch_entry(entry: dict, output_dir: str, use_cache: bool = True) -> dict:
+    """Generate and persist one manifest entry; never raises."""
+    started = time.perf_counter()
+    row = {"project": entry["project"], "query": entry["query"], "pages": entry["pages"]}
+    try:
+        plan = SearchPlan()
+        for page in entry["pages"]:
+            _plan_page_overrides(plan, page, entry["query"])
+        design_system = generate_cached(entry["query"], entry["project"], plan, use_cache)
+        persisted = persist_design_system(design_system, entry["pages"], output_dir, entry["query"], plan)
+        row.update(status="ok", project=design_system["project_name"], files=persisted["created_files"],
+                   written=persisted["written_files"], lookups=plan.lookups)
+    except Exception as e:  # one broken entry must not sink the batch
+        row.update(status="error", error=f"{type(e).__name__}: {e}", files=[], written=[])
+    row["seconds"] = round(time.perf_counter() - started, 4)
+    return row
+
+
+def generate_batch(manifest, output_dir: str = None, workers: int = None, use_cache: bool = True) -> dict:
+    """
+    Generate and persist design systems for every entry of a manifest.
+
+    manifest is a path (see load_manifest) or a list of entries. Entries are
+    spread over a process pool whose workers warm() once and then share their
+    indexes across all entries they handle; workers=1 runs in-process.
+    Returns a summary report with per-project status and timings.
+    """
+    entries = load_manifest(manifest) if isinstance(manifest, (str, Path)) else manifest
+    started = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, max(len(entries), 1))
+    if workers <= 1:
+        warm()
+        rows = [_batch_entry(entry, output_dir, use_cache) for entry in entries]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=warm) as pool:
+            rows = list(pool.map(_batch_entry, entries, [output_dir] * len(entries), [use_cache] * len(entries)))
+
+    timings = sorted(row["seconds"] for row in rows)
+    return {
+        "total": len(rows),
+        "ok": sum(row["status"] == "ok" for row in rows),
+        "failed": sum(row["status"] != "ok" for row in rows),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - started, 4),
+        "slowest": timings[-1] if timings else 0,
+        "written": sum(len(row["written"]) for row in rows),
+        "median": timings[len(timings) // 2] if timings else 0,
+        "projects": rows
+    }
+
+
+def format_batch_report(report: dict) -> str:
+    """Plain-text summary of generate_batch()."""
+    lines = [f"{'STATUS':<7}{'SECONDS':>9}  {'PAGES':>5}  PROJECT"]
+    for row in report["projects"]:
+        lines.append(f"{row['status']:<7}{row['seconds']:>9.3f}  {len(row['pages']):>5}  {row['project'] or row['query']}")
+        if row.get("error"):
+            lines.append(f"{'':<18}{row['error']}")
+    lines.append("")
+    lines.append(f"{report['ok']}/{report['total']} ok, {report['failed']} failed, {report['written']} file(s) written "
+                 f"in {report['seconds']:.2f}s "
+                 f"with {report['workers']} worker(s) (median {report['median']:.3f}s, slowest {report['slowest']:.3f}s)")
+    return "\n".join(lines)
+
+
 # ============ CLI SUPPORT ============
 if __name__ == "__main__":
     import argparse
@@ -1060,8 +1701,9 @@ if __name__ == "__main__":
     parser.add_argument("query", help="Search query (e.g., 'SaaS dashboard')")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name")
     parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk memo cache")
 
     args = parser.parse_args()
 
-    result = generate_design_system(args.query, args.project_name, args.format)
+    result = generate_design_system(args.query, args.project_name, args.format, use_cache=not args.no_cache)
     print(result)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Icons - Resolve many UI concepts to icons in one pass
+Usage: from icons import resolve_icons
+       resolve_icons(["home", "settings", "delete", "success", "notifications"])
+       python search.py "home, settings, delete, success" --icons
+
+Concepts are matched against an exact icon-name dict first ("arrow-left",
+"ArrowLeft" and "arrow left" are the same name), then scored with the shared
+BM25 index of icons.csv. The Import Code lines of every match are merged into
+one import statement per module.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+from core import CSV_CONFIG, DATA_DIR, load_index
+
+# ============ CONFIGURATION ============
+ICON_CONFIG = CSV_CONFIG["icons"]
+
+_CAMEL_BOUNDARY = re.compile(r"([a-z0-9])([A-Z])")
+_NAMED_IMPORT = re.compile(r"^\s*import\s*\{([^}]*)\}\s*from\s*(['\"])([^'\"]+)\2\s*;?\s*$")
+
+_EXACT = (None, {})
+_EXACT_LOCK = threading.Lock()
+
+
+def normalize_name(name):
+    """'ArrowLeft', 'arrow-left', 'arrow_left' -> 'arrow left'"""
+    name = _CAMEL_BOUNDARY.sub(r"\1 \2", name)
+    return " ".join(re.sub(r"[^\w\s]|_", " ", name.lower()).split())
+
+
+def _index():
+    return load_index(DATA_DIR / ICON_CONFIG["file"], ICON_CONFIG["search_cols"], ICON_CONFIG["output_cols"])
+
+
+def _exact_names(index):
+    """Normalized icon name and component name -> doc index, built once per loaded index"""
+    global _EXACT
+    with _EXACT_LOCK:
+        if _EXACT[0] is not index:
+            names = {}
+            for idx in range(index.N):
+                row = index.fetch(idx)
+                for name in (row.get("Icon Name", ""), row.get("Usage", "").strip("<>/ ")):
+                    names.setdefault(normalize_name(name), idx)
+            names.pop("", None)
+            _EXACT = (index, names)
+        return _EXACT[1]
+
+
+def merge_imports(lines):
+    """Dedupe import lines; named imports from the same module become one sorted statement"""
+    modules = OrderedDict()
+    others = []
+    for line in lines:
+        match = _NAMED_IMPORT.match(line or "")
+        if match:
+            names = modules.setdefault(match.group(3), set())
+            names.update(name.strip() for name in match.group(1).split(",") if name.strip())
+        elif line and line.strip() and line.strip() not in others:
+            others.append(line.strip())
+    merged = [f"import {{ {', '.join(sorted(names))} }} from '{module}'" for module, names in modules.items()]
+    return "\n".join(merged + others)
+
+
+def _singular(key):
+    """Naive plural stripping for a second chance: 'notifications' -> 'notification'"""
+    return " ".join(word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+                    for word in key.split())
+
+
+def _resolve(index, exact, key):
+    """(doc index, "exact" | "bm25") for a normalized concept, or (None, None)"""
+    for candidate in dict.fromkeys((key, _singular(key))):
+        if candidate in exact:
+            return exact[candidate], "exact"
+    for candidate in dict.fromkeys((key, _singular(key))):
+        ranked = index.score(candidate, 1)
+        if ranked and ranked[0][1] > 0:
+            return ranked[0][0], "bm25"
+    return None, None
+
+
+def resolve_icons(concepts):
+    """
+    Map UI concepts (nav items, actions, statuses) to icons.
+
+    Every concept is resolved against one loaded index: exact icon names
+    first, BM25 otherwise; repeated concepts are resolved once. Returns
+    {"count", "results": [{concept, match, icon row...}], "unresolved", "imports"}.
+    """
+    filepath = DATA_DIR / ICON_CONFIG["file"]
+    if not filepath.exists():
+        return {"error": f"File not found: {filepath}", "domain": "icons"}
+
+    index = _index()
+    exact = _exact_names(index)
+    resolved = {}
+    results, unresolved = [], []
+    for concept in concepts:
+        concept = concept.strip()
+        key = normalize_name(concept)
+        if not key:
+            continue
+        if key not in resolved:
+            resolved[key] = _resolve(index, exact, key)
+        idx, match = resolved[key]
+        if idx is None:
+            unresolved.append(concept)
+            continue
+        results.append({"Concept": concept, "Match": match, **index.fetch(idx)})
+
+    return {
+        "domain": "icons",
+        "query": ", ".join(concepts),
+        "file": ICON_CONFIG["file"],
+        "count": len(results),
+        "results": results,
+        "unresolved": unresolved,
+        "imports": merge_imports(result.get("Import Code", "") for result in results)
+    }
+
+
+def split_concepts(text):
+    """'home, settings; delete\\nsuccess' -> ['home', 'settings', 'delete', 'success']"""
+    return [part.strip() for part in re.split(r"[,;\n]", text) if part.strip()]
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Indexer - Streaming (SPIMI) index builder for large CSV corpora
+
+Rows are read lazily, postings are accumulated in memory until the budget is
+reached, then spilled to disk as sorted runs and merged into a compiled index:
+
+    <index dir>/meta.json      corpus stats, source fingerprint, columns
+    <index dir>/terms.json     term -> [offset, length, doc freq] into postings.jsonl
+    <index dir>/postings.jsonl one JSON list of [doc, [positions], impact] per term, highest impact first
+    <index dir>/docs.jsonl     output columns of each row (the doc store)
+    <index dir>/docs.idx       byte offset of each row in docs.jsonl (uint64)
+    <index dir>/doclens.bin    token count of each row (uint32)
+
+Usage: python indexer.py build <domain|stack:name> [...] [--memory-mb 64] [--workers N]
+       python indexer.py build --all [--force]
+"""
+
+import argparse
+import csv
+import hashlib
+import heapq
+import json
+import os
+import shutil
+import tempfile
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import log
+from pathlib import Path
+
+from core import BM25, CSV_CONFIG, DATA_DIR, STACK_CONFIG, Row, _STACK_COLS, bm25_impact
+
+# ============ CONFIGURATION ============
+INDEX_VERSION = 2
+INDEX_DIR = Path(os.environ.get("UIPRO_INDEX_DIR", DATA_DIR.parent / ".index"))
+MEMORY_LIMIT_MB = int(os.environ.get("UIPRO_INDEX_MEMORY_MB", "64"))
+
+# Rough CPython cost of the in-memory postings structures, used for the spill budget
+_TERM_COST = 120
+_POSTING_COST = 100
+_POSITION_COST = 36
+
+
+def _fingerprint(filepath):
+    """Cheap identity of a source file: size + modification time"""
+    stat = filepath.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def index_path(filepath, search_cols):
+    """Directory of the compiled index for a CSV and its search columns"""
+    key = hashlib.sha1(f"{Path(filepath).resolve()}|{'|'.join(search_cols)}".encode("utf-8")).hexdigest()[:12]
+    return INDEX_DIR / f"{Path(filepath).stem}-{key}"
+
+
+# ============ SPIMI BUILD ============
+def _spill(postings, run_dir, run_no):
+    """Write in-memory postings as a term-sorted run file"""
+    run_file = run_dir / f"run-{run_no:05d}.txt"
+    with open(run_file, "w", encoding="utf-8") as f:
+        for term in sorted(postings):
+            docs = postings[term]
+            body = ",".join(json.dumps([doc, positions], separators=(",", ":")) for doc, positions in docs.items())
+            f.write(f"{term}\t{len(docs)}\t{body}\n")
+    return run_file
+
+
+def _read_run(run_file):
+    """Yield (term, df, body) lines from a run file"""
+    with open(run_file, "r", encoding="utf-8") as f:
+        for line in f:
+            term, df, body = line.rstrip("\n").split("\t", 2)
+            yield term, int(df), body
+
+
+def build_index(filepath, search_cols, output_cols, out_dir=None, memory_mb=None):
+    """Build a compiled index for a CSV with bounded memory, return its directory"""
+    filepath = Path(filepath)
+    out_dir = Path(out_dir) if out_dir else index_path(filepath, search_cols)
+    budget = (MEMORY_LIMIT_MB if memory_mb is None else memory_mb) * 1024 * 1024
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    work_dir = Path(tempfile.mkdtemp(prefix=f".{out_dir.name}-", dir=out_dir.parent))
+    tokenizer = BM25()
+
+    try:
+        runs = []
+        postings, used = {}, 0
+        doc_lengths, doc_offsets = array("I"), array("Q")
+        offset = 0
+
+        with open(filepath, "r", encoding="utf-8", newline="") as src, open(work_dir / "docs.jsonl", "wb") as docs:
+            for doc, row in enumerate(csv.DictReader(src)):
+                record = json.dumps({col: row.get(col, "") for col in output_cols if col in row}, ensure_ascii=False).encode("utf-8") + b"\n"
+                doc_offsets.append(offset)
+                docs.write(record)
+                offset += len(record)
+
+                tokens = tokenizer.tokenize(" ".join(str(row.get(col, "")) for col in search_cols))
+                doc_lengths.append(len(tokens))
+                for pos, word in enumerate(tokens):
+                    term_docs = postings.get(word)
+                    if term_docs is None:
+                        term_docs = postings[word] = {}
+                        used += _TERM_COST + len(word)
+                    positions = term_docs.get(doc)
+                    if positions is None:
+                        positions = term_docs[doc] = []
+                        used += _POSTING_COST
+                    positions.append(pos)
+                    used += _POSITION_COST
+
+                if used >= budget:
+                    runs.append(_spill(postings, work_dir, len(runs)))
+                    postings, used = {}, 0
+
+        if postings:
+            runs.append(_spill(postings, work_dir, len(runs)))
+        postings = None
+
+        # Runs hold increasing doc ids, so merging by term (stable on run order) keeps postings sorted;
+        # each merged list is then scored once and stored in impact order
+        n_docs = len(doc_lengths)
+        avgdl = sum(doc_lengths) / n_docs if n_docs else 0
+        k1, b = tokenizer.k1, tokenizer.b
+        terms = {}
+        with open(work_dir / "postings.jsonl", "wb") as out:
+            position, current, df, chunks = 0, None, 0, []
+
+            def flush():
+                nonlocal position
+                idf = log((n_docs - df + 0.5) / (df + 0.5) + 1)
+                entries = [[doc, positions, bm25_impact(len(positions), idf, doc_lengths[doc], avgdl, k1, b)]
+                           for doc, positions in json.loads("[" + ",".join(chunks) + "]")]
+                entries.sort(key=lambda e: (-e[2], e[0]))
+                data = (json.dumps(entries, separators=(",", ":")) + "\n").encode("utf-8")
+                out.write(data)
+                terms[current] = [position, len(data), df]
+                position += len(data)
+
+            for term, run_df, body in heapq.merge(*(_read_run(r) for r in runs), key=lambda item: item[0]):
+                if term != current:
+                    if current is not None:
+                        flush()
+                    current, df, chunks = term, 0, []
+                df += run_df
+                chunks.append(body)
+            if current is not None:
+                flush()
+
+        for run_file in runs:
+            run_file.unlink()
+
+        with open(work_dir / "terms.json", "w", encoding="utf-8") as f:
+            json.dump(terms, f, ensure_ascii=False, separators=(",", ":"))
+        with open(work_dir / "doclens.bin", "wb") as f:
+            doc_lengths.tofile(f)
+        with open(work_dir / "docs.idx", "wb") as f:
+            doc_offsets.tofile(f)
+        with open(work_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "source": str(filepath.resolve()),
+                "fingerprint": _fingerprint(filepath),
+                "search_cols": list(search_cols),
+                "output_cols": list(output_cols),
+                "N": n_docs,
+                "avgdl": avgdl,
+                "k1": k1,
+                "b": b,
+                "runs": len(runs)
+            }, f, indent=2)
+
+        if out_dir.exists():
+            shutil.rmtree(out_dir)
+        os.replace(work_dir, out_dir)
+    finally:
+        if work_dir.exists():
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return out_dir
+
+
+# ============ COMPILED INDEX READER ============
+class _DiskPostings:
+    """Read-only term -> {doc: positions} mapping backed by postings.jsonl"""
+
+    def __init__(self, path, terms):
+        self._file = open(path, "rb")
+        self._lock = threading.Lock()
+        self._terms = terms
+        self._cache = {}
+
+    def entry(self, term):
+        """Decoded ({doc: positions}, doc ids, impacts) for a term"""
+        cached = self._cache.get(term)
+        if cached is None:
+            offset, length, _ = self._terms[term]
+            with self._lock:
+                self._file.seek(offset)
+                raw = self._file.read(length)
+            entries = json.loads(raw)
+            cached = ({doc: positions for doc, positions, _ in entries},
+                      array("I", [e[0] for e in entries]), array("d", [e[2] for e in entries]))
+            if len(self._cache) >= 256:
+                self._cache.clear()
+            self._cache[term] = cached
+        return cached
+
+    def __contains__(self, term):
+        return term in self._terms
+
+    def __getitem__(self, term):
+        return self.entry(term)[0]
+
+    def get(self, term, default=None):
+        return self[term] if term in self._terms else default
+
+
+class _DiskImpacts:
+    """Read-only term -> (doc ids, impacts) view sharing _DiskPostings' reads"""
+
+    def __init__(self, postings):
+        self._postings = postings
+
+    def __contains__(self, term):
+        return term in self._postings
+
+    def __getitem__(self, term):
+        return self._postings.entry(term)[1:]
+
+
+class DiskIndex(BM25):
+    """BM25 over a compiled index; only the postings (and stored impacts) of query terms are read"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        super().__init__(self.meta["k1"], self.meta["b"])
+        with open(self.path / "terms.json", "r", encoding="utf-8") as f:
+            terms = json.load(f)
+
+        self.N = self.meta["N"]
+        self.avgdl = self.meta["avgdl"]
+        self.doc_lengths = array("I")
+        self.doc_offsets = array("Q")
+        with open(self.path / "doclens.bin", "rb") as f:
+            self.doc_lengths.fromfile(f, self.N)
+        with open(self.path / "docs.idx", "rb") as f:
+            self.doc_offsets.fromfile(f, self.N)
+
+        for term, (_, _, df) in terms.items():
+            self.doc_freqs[term] = df
+            self.idf[term] = log((self.N - df + 0.5) / (df + 0.5) + 1)
+        self.postings = _DiskPostings(self.path / "postings.jsonl", terms)
+        self.impacts = _DiskImpacts(self.postings)
+        self._docs = open(self.path / "docs.jsonl", "rb")
+        self._docs_lock = threading.Lock()
+
+    def fetch(self, doc_idx):
+        """Output columns of a document from the doc store"""
+        with self._docs_lock:
+            self._docs.seek(self.doc_offsets[doc_idx])
+            line = self._docs.readline()
+        return json.loads(line)
+
+    def row(self, doc_idx):
+        """Result row of a document; its view is built as it is read from the doc store"""
+        return Row(self.fetch(doc_idx))
+
+
+_OPEN_INDEXES = {}
+
+
+def _is_fresh(out_dir, filepath, search_cols, output_cols):
+    """True if a compiled index exists and matches the current source file"""
+    try:
+        with open(out_dir / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (meta.get("version") == INDEX_VERSION
+            and meta.get("fingerprint") == _fingerprint(filepath)
+            and meta.get("search_cols") == list(search_cols)
+            and meta.get("output_cols") == list(output_cols))
+
+
+def open_index(filepath, search_cols, output_cols):
+    """Open the compiled index for a CSV, (re)building it when missing or stale"""
+    out_dir = index_path(filepath, search_cols)
+    index = _OPEN_INDEXES.get(out_dir)
+    if index is not None and index.meta["fingerprint"] == _fingerprint(Path(filepath)):
+        return index
+    if not _is_fresh(out_dir, Path(filepath), search_cols, output_cols):
+        build_index(filepath, search_cols, output_cols, out_dir)
+    index = _OPEN_INDEXES[out_dir] = DiskIndex(out_dir)
+    return index
+
+
+def has_index(filepath, search_cols):
+    """True if a compiled index was built for this CSV (it may still be stale)"""
+    return (index_path(filepath, search_cols) / "meta.json").exists()
+
+
+# ============ PARALLEL BUILD ============
+def all_targets():
+    """Every buildable target: domain names, then stacks as stack:<name>"""
+    return list(CSV_CONFIG.keys()) + [f"stack:{stack}" for stack in STACK_CONFIG]
+
+
+def resolve_target(name):
+    """Map a domain or stack name to (csv path, search cols, output cols)"""
+    if name.startswith("stack:"):
+        name = name[len("stack:"):]
+    elif name in CSV_CONFIG:
+        config = CSV_CONFIG[name]
+        return DATA_DIR / config["file"], config["search_cols"], config["output_cols"]
+    if name in STACK_CONFIG:
+        return DATA_DIR / STACK_CONFIG[name]["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"]
+    raise ValueError(f"Unknown domain or stack: {name}")
+
+
+def _build_target(target, memory_mb):
+    """Process-pool worker: compile one target and report its stats"""
+    filepath, search_cols, output_cols = resolve_target(target)
+    out_dir = build_index(filepath, search_cols, output_cols, memory_mb=memory_mb)
+    with open(out_dir / "meta.json", "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return {"target": target, "index": str(out_dir), "docs": meta["N"], "runs": meta["runs"]}
+
+
+def build_indexes(targets=None, workers=None, memory_mb=None, force=False):
+    """
+    Compile indexes for several targets across a process pool.
+
+    Each CSV is tokenized and merged independently, so files build in parallel;
+    results come back in target order regardless of completion order. Targets
+    with a fresh index are skipped unless force is set. memory_mb is per worker.
+    """
+    pending = []
+    for target in targets or all_targets():
+        filepath, search_cols, output_cols = resolve_target(target)
+        if not filepath.exists():
+            continue
+        if force or not _is_fresh(index_path(filepath, search_cols), filepath, search_cols, output_cols):
+            pending.append(target)
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        return [_build_target(target, memory_mb) for target in pending]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_build_target, pending, [memory_mb] * len(pending)))
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max Index Builder")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Compile on-disk indexes for domains/stacks")
+    build.add_argument("targets", nargs="*", help="Domain names or stack:<name>")
+    build.add_argument("--all", action="store_true", help="Build every domain and stack")
+    build.add_argument("--force", action="store_true", help="Rebuild even if the index is fresh")
+    build.add_argument("--workers", "-j", type=int, default=None, help="Parallel build processes (default: CPU count)")
+    build.add_argument("--memory-mb", type=int, default=MEMORY_LIMIT_MB, help=f"Postings memory budget per worker before spilling (default: {MEMORY_LIMIT_MB})")
+
+    args = parser.parse_args()
+    if not args.targets and not args.all:
+        parser.error("give one or more targets or --all")
+
+    try:
+        built = build_indexes(all_targets() if args.all else args.targets, args.workers, args.memory_mb, args.force)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    for stats in built:
+        print(f"{stats['target']}: {stats['docs']} docs, {stats['runs']} runs -> {stats['index']}")
+    print(f"Built {len(built)} index(es)")
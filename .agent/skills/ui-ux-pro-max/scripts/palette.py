@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Palette - Perceptual nearest-palette search over colors.csv
+Usage: from palette import search_color
+       search_color("#1E40AF")                        (nearest palettes to one brand color)
+       search_color("#1E40AF, #F97316")               (each color matched to any role)
+       search_color("primary=#1E40AF cta=#F97316")    (role-aware)
+       python search.py "#1E40AF" --color
+
+Every hex value of colors.csv is converted to OKLab once and indexed in a
+KD-tree; distances are Euclidean in OKLab (x100, roughly a JND of 1-2).
+Each match comes with WCAG contrast ratios for its usual text/surface pairs.
+"""
+
+import csv
+import heapq
+import json
+import re
+import threading
+
+from core import CSV_CONFIG, DATA_DIR, MAX_RESULTS
+
+# ============ CONFIGURATION ============
+COLOR_FILE = CSV_CONFIG["color"]["file"]
+ROLES = {
+    "primary": "Primary (Hex)",
+    "secondary": "Secondary (Hex)",
+    "cta": "CTA (Hex)",
+    "background": "Background (Hex)",
+    "text": "Text (Hex)",
+    "border": "Border (Hex)"
+}
+# (foreground role, background role) pairs checked for every matched palette; "white" is #FFFFFF
+PAIRINGS = [("text", "background"), ("primary", "background"), ("cta", "background"), ("white", "cta"), ("white", "primary")]
+WCAG_AA = 4.5
+WCAG_AA_LARGE = 3.0
+WCAG_AAA = 7.0
+
+_HEX_RE = re.compile(r"#?([0-9a-fA-F]{6}|[0-9a-fA-F]{3})")
+# Whole "#..." words and role=value pairs; their values are validated with parse_hex, never cut to fit
+_HASH_WORD_RE = re.compile(r"(?<![0-9A-Za-z])#[0-9A-Za-z]+")
+_ROLE_RE = re.compile(r"(?<![0-9A-Za-z])([a-zA-Z]+)\s*[=:]\s*(#?[0-9A-Za-z]+)(?![0-9A-Za-z])")
+
+
+# ============ COLOR MATH ============
+def parse_hex(value):
+    """'#1E40AF', '1e40af' or '#14a' -> (r, g, b) in 0..255; ValueError if not a hex color"""
+    match = _HEX_RE.fullmatch(value.strip())
+    if not match:
+        raise ValueError(f"Not a hex color: {value!r}")
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(ch * 2 for ch in digits)
+    return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _linear(channel):
+    """sRGB channel 0..255 -> linear light 0..1"""
+    c = channel / 255
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def oklab(hex_color):
+    """Hex color -> (L, a, b) in OKLab"""
+    r, g, b = (_linear(c) for c in parse_hex(hex_color))
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+            1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+            0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s)
+
+
+def delta_e(p, q):
+    """Euclidean OKLab distance scaled x100"""
+    return 100 * sum((x - y) ** 2 for x, y in zip(p, q)) ** 0.5
+
+
+def luminance(hex_color):
+    """WCAG relative luminance"""
+    r, g, b = (_linear(c) for c in parse_hex(hex_color))
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def contrast_ratio(fg, bg):
+    """WCAG contrast ratio between two hex colors (1..21)"""
+    high, low = sorted((luminance(fg), luminance(bg)), reverse=True)
+    return (high + 0.05) / (low + 0.05)
+
+
+def wcag_level(ratio):
+    """AAA / AA / AA Large / Fail for a contrast ratio"""
+    if ratio >= WCAG_AAA:
+        return "AAA"
+    if ratio >= WCAG_AA:
+        return "AA"
+    return "AA Large" if ratio >= WCAG_AA_LARGE else "Fail"
+
+
+# ============ KD-TREE ============
+class KDTree:
+    """Static KD-tree over fixed-dimension points, each carrying a payload"""
+
+    def __init__(self, points):
+        """points: list of (coords, payload)"""
+        self.dims = len(points[0][0]) if points else 0
+        self.root = self._build(list(points), 0)
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % self.dims
+        points.sort(key=lambda point: point[0][axis])
+        mid = len(points) // 2
+        return (points[mid], axis, self._build(points[:mid], depth + 1), self._build(points[mid + 1:], depth + 1))
+
+    def nearest(self, target, k=1):
+        """k nearest (squared distance, payload), closest first"""
+        heap = []  # max-heap of (-dist2, counter, payload)
+        counter = 0
+
+        def visit(node):
+            nonlocal counter
+            if node is None:
+                return
+            (coords, payload), axis, left, right = node
+            dist2 = sum((x - y) ** 2 for x, y in zip(coords, target))
+            if len(heap) < k:
+                heapq.heappush(heap, (-dist2, counter, payload))
+            elif dist2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-dist2, counter, payload))
+            counter += 1
+            diff = target[axis] - coords[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return [(-neg, payload) for neg, _, payload in sorted(heap, key=lambda item: (-item[0], item[1]))]
+
+
+# ============ PALETTE INDEX ============
+class PaletteIndex:
+    """colors.csv palettes with every role color converted to OKLab once"""
+
+    def __init__(self, filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            self.rows = list(csv.DictReader(f))
+        self.points = []  # per row: {role: oklab}
+        entries = []
+        for idx, row in enumerate(self.rows):
+            points = {}
+            for role, col in ROLES.items():
+                try:
+                    points[role] = oklab(row.get(col, ""))
+                except ValueError:
+                    continue
+                entries.append((points[role], (idx, role)))
+            self.points.append(points)
+        self.tree = KDTree(entries)
+
+    def nearest_colors(self, hex_color, k=MAX_RESULTS):
+        """Closest individual palette colors: [(delta_e, row index, role)]"""
+        target = oklab(hex_color)
+        return [(100 * dist2 ** 0.5, idx, role) for dist2, (idx, role) in self.tree.nearest(target, k)]
+
+    def nearest_palettes(self, colors, k=MAX_RESULTS):
+        """
+        Palettes closest to a query: [(delta_e, row index, matched roles)].
+
+        colors is a hex string, a list of hex strings (each matched to the
+        palette's closest role) or a {role: hex} dict (matched role to role).
+        The palette distance is the mean distance over the query colors.
+        """
+        if isinstance(colors, str):
+            # One color: widen the KD-tree query until the k best palettes are certain,
+            # i.e. strictly closer than anything the query may have left out (ties included)
+            target = oklab(colors)
+            total = sum(len(points) for points in self.points)
+            want = k * len(ROLES)
+            while True:
+                best = {}
+                candidates = self.tree.nearest(target, want)
+                for _, (idx, role) in candidates:
+                    distance = delta_e(self.points[idx][role], target)
+                    if idx not in best or distance < best[idx][0]:
+                        best[idx] = (distance, idx, {role: colors})
+                ranked = sorted(best.values(), key=lambda item: (item[0], item[1]))[:k]
+                horizon = 100 * candidates[-1][0] ** 0.5 if candidates else 0.0
+                if want >= total or (len(ranked) == k and ranked[-1][0] < horizon):
+                    return ranked
+                want *= 2
+
+        if isinstance(colors, dict):
+            query = {role: oklab(hex_color) for role, hex_color in colors.items() if role in ROLES}
+        else:
+            query = {str(i): oklab(hex_color) for i, hex_color in enumerate(colors)}
+        if not query:
+            return []
+
+        scored = []
+        for idx, points in enumerate(self.points):
+            if not points:
+                continue
+            total, matched = 0.0, {}
+            for key, target in query.items():
+                if isinstance(colors, dict):
+                    if key not in points:
+                        break
+                    role = key
+                else:
+                    role = min(points, key=lambda r: delta_e(points[r], target))
+                total += delta_e(points[role], target)
+                matched[role] = colors[key] if isinstance(colors, dict) else colors[int(key)]
+            else:
+                scored.append((total / len(query), idx, matched))
+        return heapq.nsmallest(k, scored, key=lambda item: (item[0], item[1]))
+
+    def pairings(self, idx):
+        """WCAG contrast of a palette's usual foreground/background pairs"""
+        row = self.rows[idx]
+        colors = {role: row.get(col, "") for role, col in ROLES.items()}
+        colors["white"] = "#FFFFFF"
+        result = []
+        for fg, bg in PAIRINGS:
+            try:
+                ratio = contrast_ratio(colors[fg], colors[bg])
+            except ValueError:
+                continue
+            result.append({"foreground": fg, "background": bg, "ratio": round(ratio, 2), "level": wcag_level(ratio)})
+        return result
+
+
+_PALETTE_INDEX = None
+_PALETTE_FINGERPRINT = None
+_PALETTE_LOCK = threading.Lock()
+
+
+def get_palette_index():
+    """Process-wide PaletteIndex, rebuilt when colors.csv changes"""
+    global _PALETTE_INDEX, _PALETTE_FINGERPRINT
+    filepath = DATA_DIR / COLOR_FILE
+    stat = filepath.stat()
+    fingerprint = (stat.st_size, stat.st_mtime_ns)
+    with _PALETTE_LOCK:
+        if _PALETTE_INDEX is None or fingerprint != _PALETTE_FINGERPRINT:
+            _PALETTE_INDEX = PaletteIndex(filepath)
+            _PALETTE_FINGERPRINT = fingerprint
+        return _PALETTE_INDEX
+
+
+# ============ SEARCH ============
+def _normalize_hex(value):
+    """'1e40af' -> '#1e40af'; ValueError for anything but a 3 or 6 digit hex color"""
+    parse_hex(value)
+    return "#" + value.lstrip("#")
+
+
+def parse_palette(text):
+    """
+    '#1E40AF' -> str, '#1E40AF, #F97316' -> list, 'primary=#1E40AF cta=#F97316' -> {role: hex}
+
+    Colors are "#" words; bare values ("1e40af f97316") only count when the
+    whole text is colors, so words like "bad" or "face" are never read as
+    hex. A malformed value ("#1E40A") is a ValueError, not a shorter color.
+    """
+    roles = {role.lower(): value for role, value in _ROLE_RE.findall(text)
+             if role.lower() in ROLES or value.startswith("#")}
+    if roles:
+        unknown = set(roles) - set(ROLES)
+        if unknown:
+            raise ValueError(f"Unknown color role(s): {', '.join(sorted(unknown))}. Available: {', '.join(ROLES)}")
+        return {role: _normalize_hex(value) for role, value in roles.items()}
+    words = re.findall(r"[^\s,;]+", text)
+    if words and all(_HEX_RE.fullmatch(word) for word in words):
+        colors = [_normalize_hex(word) for word in words]
+    else:
+        colors = [_normalize_hex(word) for word in _HASH_WORD_RE.findall(text)]
+    if not colors:
+        raise ValueError(f"No hex colors in {text!r}")
+    return colors[0] if len(colors) == 1 else colors
+
+
+def search_color(query, max_results=MAX_RESULTS):
+    """Nearest curated palettes to a hex color or palette, with contrast-safe pairings"""
+    try:
+        colors = parse_palette(query) if isinstance(query, str) else query
+        index = get_palette_index()
+        matches = index.nearest_palettes(colors, max_results)
+    except (OSError, ValueError) as e:
+        return {"error": str(e), "domain": "color"}
+
+    results = []
+    for distance, idx, matched in matches:
+        row = index.rows[idx]
+        pairings = index.pairings(idx)
+        result = {col: row.get(col, "") for col in CSV_CONFIG["color"]["output_cols"]}
+        result["Distance"] = round(distance, 2)
+        result["Matched"] = ", ".join(f"{value} ~ {role} {row.get(ROLES[role], '')}" for role, value in matched.items())
+        result["Contrast"] = "; ".join(f"{p['foreground']} on {p['background']} {p['ratio']}:1 {p['level']}" for p in pairings)
+        result["Safe Pairings"] = ", ".join(f"{p['foreground']} on {p['background']}" for p in pairings if p["ratio"] >= WCAG_AA)
+        results.append(result)
+
+    return {
+        "domain": "color",
+        "query": query if isinstance(query, str) else json.dumps(query),
+        "file": COLOR_FILE,
+        "count": len(results),
+        "results": results
+    }
+
+
+def search_colors(queries, max_results=MAX_RESULTS):
+    """search_color() over many brand colors/palettes, sharing one index"""
+    get_palette_index()
+    return [search_color(query, max_results) for query in queries]
+
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Scan - Flag source lines matching guideline "bad" code examples
+Usage: python scan.py <dir> [--stack react nextjs ...] [--fail-on High] [--workers 8] [--json] [--no-cache]
+
+The "Code Example Bad" / "Code Bad" snippets of the react, web and ux
+guidelines and of the stack CSVs are compiled into literal patterns (prose
+snippets such as "Deep prop chains" and file layouts such as
+"components/dashboard/" are skipped) and matched in one Aho-Corasick pass per
+line. By default the stack CSVs are those detect_stacks() finds in the scanned
+directory, so a React project is not held to Vue or Svelte rules. A line
+matching several rules with the same pattern is reported once. A snippet qualified by a note ("// alone",
+"(no replacement)", "without ...") is only bad in a context a literal cannot
+see, so it is skipped unless NEGATIVE_CONDITIONS says which tokens on the same
+line make the code fine. Files are scanned in parallel; results are cached per
+file hash in <UIPRO_CACHE_DIR>/scan-<root hash>.json so re-scans only read
+changed files.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from core import CSV_CONFIG, DATA_DIR, STACK_CONFIG, PatternAutomaton, _load_csv
+from stacks import detect_stacks
+
+# ============ CONFIGURATION ============
+SCAN_VERSION = 3
+CACHE_DIR = Path(os.environ.get("UIPRO_CACHE_DIR", DATA_DIR.parent / ".cache"))
+SKIP_DIRS = {".git", "node_modules", "dist", "build", ".next", ".nuxt", ".svelte-kit", ".output",
+             "coverage", "__pycache__", ".venv", "venv", "Pods", ".dart_tool"}
+MIN_PATTERN_CHARS = 6
+# Chunk of files handed to a worker at once
+CHUNK_FILES = 64
+
+_WEB = {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs", ".vue", ".svelte", ".astro", ".html", ".css", ".scss"}
+_JS = {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"}
+# Always scanned; stack sources are added per project (see default_sources)
+BASE_SOURCES = ["react", "web", "ux"]
+# Guideline source -> file extensions its snippets apply to
+SCAN_SOURCES = {
+    "react": _JS,
+    "web": _WEB,
+    "ux": _WEB,
+    "stack:html-tailwind": _WEB,
+    "stack:react": _JS,
+    "stack:nextjs": _JS,
+    "stack:shadcn": _JS,
+    "stack:react-native": _JS,
+    "stack:astro": {".astro"} | _JS,
+    "stack:vue": {".vue"} | _JS,
+    "stack:nuxtjs": {".vue"} | _JS,
+    "stack:nuxt-ui": {".vue"} | _JS,
+    "stack:svelte": {".svelte"} | _JS,
+    "stack:swiftui": {".swift"},
+    "stack:flutter": {".dart"},
+    "stack:jetpack-compose": {".kt", ".kts"}
+}
+SEVERITY_RANK = {"Low": 1, "Low-Medium": 1.5, "Medium": 2, "Medium-High": 2.5, "High": 3, "Critical": 4}
+# Pattern -> tokens that, found on the same line, mean the guideline is already followed.
+# A qualified snippet ("focus:outline-none // alone") is only scanned when its pattern is listed here.
+NEGATIVE_CONDITIONS = {
+    "focus:outline-none": ("focus:ring", "focus-visible:", "focus-within:", "focus:border", "focus:shadow"),
+    "hover:bg-gray-100": ("transition",)
+}
+
+_CODE_CHARS = re.compile(r"[(){}\[\]<>=;:$@'\"./]")
+_TRAILING_NOTE = re.compile(r"\s+\([^()]*[A-Za-z][^()]*\)\s*$")
+_ELLIPSIS = re.compile(r"\{\s*\.\.\.\s*\}|\[\s*\.\.\.\s*\]|\(\s*\.\.\.\s*\)|\.\.\.|…")
+_PROSE_TAIL = re.compile(r"\s+(with|without|instead of|everywhere|for every|on every)\s.*$")
+_LINE_COMMENT = re.compile(r"\s+//.*$")
+_FILE_LAYOUT = re.compile(r"^[\w@.+ -]*/[\w@.+/ -]*$")
+
+
+# ============ RULES ============
+def code_pattern(snippet):
+    """
+    Literal, whitespace-normalized pattern for a bad code snippet, or None.
+
+    None for prose, for file layouts ("components/Button.tsx"), and for snippets whose qualifying note was stripped
+    unless NEGATIVE_CONDITIONS covers the resulting pattern.
+    """
+    original = (snippet or "").strip()
+    text = _PROSE_TAIL.sub("", _LINE_COMMENT.sub("", _TRAILING_NOTE.sub("", original)))
+    fragments = [" ".join(part.split()) for part in _ELLIPSIS.split(text)]
+    pattern = max(fragments, key=len, default="")
+    if len(pattern) < MIN_PATTERN_CHARS or not _CODE_CHARS.search(pattern) or _FILE_LAYOUT.match(pattern):
+        return None
+    if text != original and pattern not in NEGATIVE_CONDITIONS:
+        return None
+    return pattern
+
+
+def load_rules(sources=None):
+    """[(pattern, rule)] for every code-like bad snippet of the selected sources"""
+    rules = []
+    for source in sources or SCAN_SOURCES:
+        if source.startswith("stack:"):
+            filepath = DATA_DIR / STACK_CONFIG[source[6:]]["file"]
+        else:
+            filepath = DATA_DIR / CSV_CONFIG[source]["file"]
+        if not filepath.exists():
+            continue
+        for row in _load_csv(filepath):
+            pattern = code_pattern(row.get("Code Example Bad") or row.get("Code Bad"))
+            if pattern is None:
+                continue
+            rules.append((pattern, {
+                "source": source,
+                "file": filepath.name,
+                "no": row.get("No", ""),
+                "category": row.get("Category", ""),
+                "guideline": row.get("Issue") or row.get("Guideline", ""),
+                "severity": row.get("Severity") or "Medium",
+                "do": row.get("Do", ""),
+                "good": row.get("Code Example Good") or row.get("Code Good", ""),
+                "pattern": pattern,
+                "unless": list(NEGATIVE_CONDITIONS.get(pattern, ())),
+                "extensions": sorted(SCAN_SOURCES[source])
+            }))
+    return rules
+
+
+def default_sources(root):
+    """BASE_SOURCES plus the stack CSVs of the stacks detected in root"""
+    return BASE_SOURCES + [f"stack:{stack}" for stack in detect_stacks(root)["stacks"] if f"stack:{stack}" in SCAN_SOURCES]
+
+
+def rules_fingerprint(rules):
+    """Hash of the compiled rule set; a change invalidates every cached file result"""
+    payload = json.dumps([SCAN_VERSION, [(pattern, rule["source"], rule["no"], rule["severity"], rule["unless"])
+                                         for pattern, rule in rules]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ============ WORKER ============
+_AUTOMATON = None
+_RULES = None
+
+
+def _init_worker(rules):
+    """Compile the automaton once per worker process"""
+    global _AUTOMATON, _RULES
+    _RULES = rules
+    _AUTOMATON = PatternAutomaton((pattern, i) for i, (pattern, _) in enumerate(rules))
+
+
+def _scan_text(text, suffix):
+    """[(line, rule index)] for one file's text"""
+    hits = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        normalized = " ".join(line.split())
+        if not normalized:
+            continue
+        seen = set()
+        for _, _, i in _AUTOMATON.matches(normalized):
+            rule = _RULES[i][1]
+            if i in seen or suffix not in rule["extensions"]:
+                continue
+            seen.add(i)
+            if not any(token in normalized for token in rule["unless"]):
+                hits.append((lineno, i))
+    return hits
+
+
+def _scan_files(paths):
+    """Scan a chunk of files: [(path, sha256, stat key, hits)]; unreadable files are skipped"""
+    out = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        hits = _scan_text(data.decode("utf-8", errors="replace"), Path(path).suffix.lower())
+        out.append((path, digest, [stat.st_size, stat.st_mtime_ns], hits))
+    return out
+
+
+# ============ SCANNER ============
+def _walk(root, extensions):
+    """Source files under root with a scanned extension, skipping vendored/build dirs"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if os.path.splitext(name)[1].lower() in extensions:
+                yield os.path.join(dirpath, name)
+
+
+def cache_path_for(root):
+    """Default cache file of a scanned root, kept out of the scanned tree"""
+    key = hashlib.sha1(str(Path(root).resolve()).encode("utf-8")).hexdigest()[:12]
+    return CACHE_DIR / f"scan-{key}.json"
+
+
+def _load_cache(path, fingerprint):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("rules") == fingerprint:
+            return cache.get("files", {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def scan(root, sources=None, workers=None, use_cache=True, cache_path=None):
+    """
+    Scan a source tree against the guideline rules.
+
+    sources defaults to default_sources(root). Files whose size and mtime are
+    unchanged reuse their cached findings; files whose content hash is
+    unchanged are not rescanned either. Returns
+    {"root", "files", "scanned", "cached", "findings": [{path, line, severity, guideline, ...}]}.
+    """
+    root = Path(root)
+    sources = sources or default_sources(root)
+    rules = load_rules(sources)
+    fingerprint = rules_fingerprint(rules)
+    cache_path = Path(cache_path) if cache_path else cache_path_for(root)
+    cached = _load_cache(cache_path, fingerprint) if use_cache else {}
+    extensions = set().union(*(SCAN_SOURCES[source] for source in sources))
+
+    files = {}
+    pending = []
+    for path in _walk(root, extensions):
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        entry = cached.get(rel)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if entry and entry["stat"] == [stat.st_size, stat.st_mtime_ns]:
+            files[rel] = entry
+        else:
+            pending.append(path)
+
+    # Changed (or new) files: hash + scan in parallel; unchanged hashes keep their cached hits
+    scanned = 0
+    if pending:
+        chunks = [pending[i:i + CHUNK_FILES] for i in range(0, len(pending), CHUNK_FILES)]
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        if workers <= 1:
+            _init_worker(rules)
+            results = list(map(_scan_files, chunks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules,)) as pool:
+                results = list(pool.map(_scan_files, chunks))
+        for chunk in results:
+            for path, digest, stat, hits in chunk:
+                rel = os.path.relpath(path, root).replace(os.sep, "/")
+                previous = cached.get(rel)
+                if previous and previous["sha256"] == digest:
+                    files[rel] = {**previous, "stat": stat}
+                    continue
+                scanned += 1
+                files[rel] = {"sha256": digest, "stat": stat, "hits": hits}
+
+    if use_cache:
+        # A cache that cannot be written (read-only cache dir) only costs the next scan its reuse
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"rules": fingerprint, "files": files}, f)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+
+    # Rules sharing a pattern (web, ux and a stack all ban focus:outline-none) report a line once, most severe first
+    findings, reported = [], set()
+    hits = [(rel, lineno, rules[i][1]) for rel in sorted(files) for lineno, i in files[rel]["hits"]]
+    hits.sort(key=lambda hit: (-SEVERITY_RANK.get(hit[2]["severity"], 2), hit[0], hit[1]))
+    for rel, lineno, rule in hits:
+        if (rel, lineno, rule["pattern"]) in reported:
+            continue
+        reported.add((rel, lineno, rule["pattern"]))
+        findings.append({"path": rel, "line": lineno, **{k: v for k, v in rule.items() if k not in ("extensions", "unless")}})
+    return {
+        "root": str(root),
+        "rules": len(rules),
+        "files": len(files),
+        "scanned": scanned,
+        "cached": len(files) - scanned,
+        "findings": findings
+    }
+
+
+def format_scan(report):
+    """One line per finding (path:line [severity] guideline -> do) plus totals"""
+    lines = []
+    for f in report["findings"]:
+        lines.append(f"{f['path']}:{f['line']}: [{f['severity']}] {f['guideline']} ({f['file']} #{f['no']})")
+        lines.append(f"    matched: {f['pattern']}")
+        if f["do"]:
+            lines.append(f"    do: {f['do']}")
+    lines.append(f"{len(report['findings'])} finding(s) in {report['files']} file(s) "
+                 f"({report['scanned']} scanned, {report['cached']} from cache, {report['rules']} rules)")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max Guideline Scan")
+    parser.add_argument("root", help="Source directory to scan")
+    parser.add_argument("--stack", nargs="+", choices=sorted(STACK_CONFIG), default=None,
+                        help="Only these stacks' rules (plus react/web/ux); default: the stacks detected in root")
+    parser.add_argument("--workers", "-j", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--fail-on", choices=list(SEVERITY_RANK), default=None,
+                        help="Exit 1 if any finding is at least this severe")
+    parser.add_argument("--no-cache", action="store_true", help=f"Ignore and do not write the scan cache in {CACHE_DIR}")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    sources = None
+    if args.stack:
+        sources = BASE_SOURCES + [f"stack:{stack}" for stack in args.stack]
+    report = scan(args.root, sources, args.workers, not args.no_cache)
+    print(json.dumps(report, indent=2, ensure_ascii=False) if args.json else format_scan(report))
+    if args.fail_on and any(SEVERITY_RANK.get(f["severity"], 2) >= SEVERITY_RANK[args.fail_on] for f in report["findings"]):
+        sys.exit(1)
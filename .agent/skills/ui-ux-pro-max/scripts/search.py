@@ -3,22 +3,47 @@
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+       python search.py "<query>" --stack auto [--project-dir .]   (detect the project's stack(s))
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist --page dashboard,settings [--pages-file pages.txt]
+       python search.py '"dark mode" dashboard'   (exact phrase matches rank first)
+       python search.py "home, settings, delete, success" --icons   (many concepts, one merged import)
+       python search.py "#1E40AF" --color         (nearest palettes; also "#1E40AF, #F97316" or "primary=#1E40AF cta=#F97316")
+       python search.py --batch tenants.json [-o out] [--workers 8] [--report report.json]
+       python search.py --stdin   (one JSON request per line in, one JSON response per line out)
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
-Stacks: html-tailwind, react, nextjs
+Stacks: html-tailwind, react, nextjs, ... or auto (detected from package.json, config files, extensions)
 
 Persistence (Master + Overrides pattern):
-  --persist    Save design system to design-system/MASTER.md
-  --page       Also create a page-specific override file in design-system/pages/
+  --persist    Save design system to design-system/MASTER.md (+ tokens.json / tokens.css)
+  --page       Also create page-specific override files in design-system/pages/ (repeat or comma separate for more pages)
+  --pages-file File with one page name per line (added to --page)
+
+Batch (many projects, shared warm indexes):
+  --batch      Manifest (JSON/CSV of project, query, pages); persists every entry
+
+JSON lines (--stdin, indexes stay loaded between requests):
+  request   {"id": 1, "query": "...", "domain": "ux", "stack": "react", "max_results": 3,
+             "icons": false, "color": false, "project_dir": "...",
+             "design_system": true, "project_name": "...", "format": "ascii|markdown|json",
+             "persist": false, "page": ["dashboard"], "output_dir": "..."}
+  response  {"id": 1, "ok": true, "result": {...}}  or  {"id": 1, "ok": false, "error": "..."}
+            (design_system with format json and persist: the design system plus
+             "persisted": {"design_system_dir", "created_files", "written_files", "tokens_hash"})
+
+  --no-cache   Regenerate instead of reusing a memoized design system
+  --no-snapshot     Skip the warm-start snapshot (indexes and rules are then built from the CSVs)
+  --build-snapshot  Rebuild the snapshot when missing or stale (writes ~3 MB to the cache dir)
 """
 
 import argparse
+import json
 import sys
 import io
 from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+from snapshot import restore
 
 # Force UTF-8 for stdout/stderr to handle emojis on Windows (cp1252 default)
 if sys.stdout.encoding and sys.stdout.encoding.lower() != 'utf-8':
@@ -53,33 +78,151 @@ def format_output(result):
     return "\n".join(output)
 
 
+def format_icons(result):
+    """Compact concept -> icon listing plus the merged import block"""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    output = [f"## UI Pro Max Icons", f"**Source:** {result['file']} | **Resolved:** {result['count']}\n"]
+    for row in result["results"]:
+        output.append(f"- **{row['Concept']}** → {row['Icon Name']} `{row['Usage']}` ({row['Match']})")
+    if result["unresolved"]:
+        output.append(f"\n**Unresolved:** {', '.join(result['unresolved'])}")
+    if result["imports"]:
+        output.append("\n```tsx")
+        output.append(result["imports"])
+        output.append("```")
+    return "\n".join(output)
+
+
+def handle_request(request, max_results=MAX_RESULTS, use_cache=True):
+    """Answer one --stdin request dict with the same dispatch as the command line"""
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    query = request.get("query")
+    if not isinstance(query, str) or not query.strip():
+        raise ValueError("request needs a non-empty \"query\" string")
+    max_results = int(request.get("max_results", max_results))
+
+    if request.get("design_system"):
+        from design_system import generate_cached, generate_design_system, persist_design_system
+        if request.get("format") == "json":
+            design_system = generate_cached(query, request.get("project_name"), use_cache=use_cache)
+            if not request.get("persist"):
+                return design_system
+            persisted = persist_design_system(design_system, request.get("page"), request.get("output_dir"), query)
+            return dict(design_system, persisted=persisted)
+        output = generate_design_system(query, request.get("project_name"), request.get("format", "ascii"),
+                                        persist=bool(request.get("persist")), page=request.get("page"),
+                                        output_dir=request.get("output_dir"), use_cache=use_cache)
+        return {"output": output}
+    if request.get("icons"):
+        from icons import resolve_icons, split_concepts
+        return resolve_icons(split_concepts(query))
+    if request.get("color"):
+        from palette import search_color
+        return search_color(query, max_results)
+    if request.get("stack"):
+        if request["stack"] != "auto" and request["stack"] not in AVAILABLE_STACKS:
+            raise ValueError(f"Unknown stack: {request['stack']}. Available: {', '.join(AVAILABLE_STACKS)}, auto")
+        return search_stack(query, request["stack"], max_results, request.get("project_dir"))
+    domain = request.get("domain")
+    if domain is not None and domain not in CSV_CONFIG:
+        raise ValueError(f"Unknown domain: {domain}. Available: {', '.join(CSV_CONFIG)}")
+    return search(query, domain, max_results)
+
+
+def serve_stdin(stdin, stdout, max_results=MAX_RESULTS, use_cache=True):
+    """
+    JSON-lines loop: one request per input line, one response per output line.
+
+    Responses are flushed as soon as they are written and echo the request's
+    "id"; a malformed or failing request gets an error response and the loop
+    goes on. Returns the number of requests answered.
+    """
+    answered = 0
+    for line in stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id") if isinstance(request, dict) else None
+            result = handle_request(request, max_results, use_cache)
+            if isinstance(result, dict) and "error" in result:
+                response = {"id": request_id, "ok": False, "error": result["error"]}
+            else:
+                response = {"id": request_id, "ok": True, "result": result}
+        except Exception as e:
+            response = {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        stdout.flush()
+        answered += 1
+    return answered
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
-    parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
+    parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS + ["auto"], help="Stack-specific search (html-tailwind, react, nextjs, ...; auto detects it)")
+    parser.add_argument("--project-dir", type=str, default=None, help="Project directory for --stack auto (default: current directory)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--stdin", action="store_true", help="Answer JSON-lines requests from stdin until EOF (see above)")
+    parser.add_argument("--icons", action="store_true", help="Treat the query as a comma-separated list of UI concepts and resolve each to an icon")
+    parser.add_argument("--color", action="store_true", help="Treat the query as hex color(s) and find the nearest palettes")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
     parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format for design system")
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
-    parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--page", type=str, action="append", default=None, help="Create page-specific override files in design-system/pages/ (repeatable, comma separated)")
+    parser.add_argument("--pages-file", type=str, default=None, help="File listing one page per line (# comments allowed)")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the design system memo cache")
+    parser.add_argument("--no-snapshot", action="store_true", help="Do not restore the warm-start snapshot")
+    parser.add_argument("--build-snapshot", action="store_true", help="Rebuild the warm-start snapshot when missing or stale (writes ~3 MB to the cache dir)")
+    # Batch generation
+    parser.add_argument("--batch", type=str, default=None, help="Manifest (JSON/CSV of project, query, pages) to generate and persist in bulk")
+    parser.add_argument("--workers", "-j", type=int, default=None, help="Worker processes for --batch (default: CPU count)")
+    parser.add_argument("--report", type=str, default=None, help="Also write the --batch summary report as JSON to this file")
 
     args = parser.parse_args()
+    if not args.query and not args.batch and not args.stdin:
+        parser.error("the query argument is required (unless --batch or --stdin is given)")
+    if not args.no_snapshot:
+        restore(rebuild=args.build_snapshot)
+    # Mode dispatch. Feature modules are imported by the branch that needs them: a plain search stays light
+    if args.stdin:
+        serve_stdin(sys.stdin, sys.stdout, args.max_results, not args.no_cache)
+        sys.exit(0)
+    pages = [name.strip() for value in args.page or [] for name in value.split(",") if name.strip()]
+    if args.pages_file:
+        from design_system import load_pages
+        pages += load_pages(args.pages_file)
 
+    # Batch mode
+    if args.batch:
+        from design_system import generate_batch, format_batch_report
+        report = generate_batch(args.batch, args.output_dir, args.workers, not args.no_cache)
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        print(json.dumps(report, indent=2, ensure_ascii=False) if args.json else format_batch_report(report))
+        sys.exit(1 if report["failed"] else 0)
     # Design system takes priority
-    if args.design_system:
+    elif args.design_system:
+        from design_system import generate_design_system
         result = generate_design_system(
             args.query, 
             args.project_name, 
             args.format,
             persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
+            page=pages,
+            output_dir=args.output_dir,
+            use_cache=not args.no_cache
         )
         print(result)
         
@@ -89,18 +232,34 @@ if __name__ == "__main__":
             print("\n" + "=" * 60)
             print(f"✅ Design system persisted to design-system/{project_slug}/")
             print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
+            print(f"   🎨 design-system/{project_slug}/tokens.json + tokens.css (Design Tokens)")
+            for page in pages:
+                page_filename = page.lower().replace(' ', '-')
                 print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
             print("")
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
             print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
             print("=" * 60)
+    # Bulk icon resolution
+    elif args.icons:
+        from icons import resolve_icons, split_concepts
+        result = resolve_icons(split_concepts(args.query))
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_icons(result))
+    # Perceptual palette search
+    elif args.color:
+        from palette import search_color
+        result = search_color(args.query, args.max_results)
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_output(result))
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
+        result = search_stack(args.query, args.stack, args.max_results, args.project_dir)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
@@ -108,7 +267,6 @@ if __name__ == "__main__":
     else:
         result = search(args.query, args.domain, args.max_results)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
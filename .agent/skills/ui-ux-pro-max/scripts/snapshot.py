@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Snapshot - Whole-engine warm start from one file
+Usage: from snapshot import restore
+       restore()                        (at startup; search.py does this unless --no-snapshot)
+       restore(rebuild=True)            (also rebuild a missing or stale snapshot; search.py --build-snapshot)
+       python snapshot.py [build|info]
+
+The snapshot holds every in-memory domain and stack index, the reasoning rules
+(with Decision_Rules parsed), the page-type classifier and the domain detector
+automaton. restore() reads it with one read and one unpickle of the outer
+container; each component stays pickled bytes until first use, so a search
+touching one index only pays for that index.
+
+The snapshot is dropped when SNAPSHOT_VERSION, the Python version or the engine
+code (core.py, indexer.py, design_system.py) changed; a component is skipped when
+its source CSV changed. Stale components are then built from the CSVs on demand;
+only restore(rebuild=True) or "snapshot.py build" writes a new snapshot (~3 MB),
+reusing every component that is still fresh.
+"""
+
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import core
+from core import DATA_DIR, STACK_CONFIG, CsvIndex
+
+# ============ CONFIGURATION ============
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE = Path(os.environ.get("UIPRO_SNAPSHOT_FILE")
+                     or Path(os.environ.get("UIPRO_CACHE_DIR", DATA_DIR.parent / ".cache")) / "snapshot.pickle")
+CODE_FILES = ("core.py", "indexer.py", "design_system.py")
+
+
+def _code_fingerprint():
+    """Everything a pickled component's layout depends on"""
+    here = Path(__file__).parent
+    files = []
+    for name in CODE_FILES:
+        stat = (here / name).stat()
+        files.append((name, stat.st_size, stat.st_mtime_ns))
+    return (SNAPSHOT_VERSION, sys.version_info[:2], tuple(files))
+
+
+def _stat_fingerprint(path):
+    """(size, mtime_ns) of a component's source file; None for sourceless components"""
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+# ============ BUILD / RESTORE ============
+def build(path=None):
+    """Warm every component (reusing restored fresh ones), then write the snapshot atomically"""
+    import design_system
+
+    path = Path(path or SNAPSHOT_FILE)
+    dump = lambda obj: pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    core.preload(None, list(STACK_CONFIG))
+    components = {}  # key -> (source path, source fingerprint, pickled component)
+    for key, (fingerprint, index) in list(core._INDEX_CACHE.items()):
+        # Compiled disk indexes are opened lazily from their own files
+        if isinstance(index, CsvIndex):
+            components[key] = (key[0], fingerprint, dump(index))
+    generator = design_system.get_generator()
+    components["generator"] = (str(DATA_DIR / design_system.REASONING_FILE),
+                               design_system._GENERATOR_FINGERPRINT, dump(generator))
+    classifier = design_system.get_page_classifier()
+    components["page_classifier"] = (str(DATA_DIR / design_system.PAGE_TYPES_FILE),
+                                     design_system._PAGE_CLASSIFIER_FINGERPRINT, dump(classifier))
+    components["domain_matcher"] = (None, None, dump(core.get_domain_matcher()))
+
+    payload = pickle.dumps({"code": _code_fingerprint(), "components": components}, pickle.HIGHEST_PROTOCOL)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+    return {"path": str(path), "bytes": len(payload), "components": len(components)}
+
+
+def _read(path):
+    """Snapshot container, or None when missing, unreadable or built by other code"""
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.loads(f.read())
+    except Exception:
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("code") != _code_fingerprint():
+        return None
+    return snapshot
+
+
+def restore(path=None, rebuild=False):
+    """
+    Install the snapshot's components for lazy use by load_index / get_generator.
+
+    Returns "restored", "rebuilt" (missing or stale snapshot, rebuilt when
+    rebuild is set), "stale" or "missing". A failed rebuild (read-only cache
+    dir) only costs the warm start: every component still builds on demand.
+    """
+    path = Path(path or SNAPSHOT_FILE)
+    snapshot = _read(path)
+    stale = snapshot is None
+    if snapshot is not None:
+        fresh = {key: (fingerprint, blob) for key, (source, fingerprint, blob) in snapshot["components"].items()
+                 if fingerprint == _stat_fingerprint(source)}
+        stale = len(fresh) != len(snapshot["components"])
+        core._SNAPSHOT.update(fresh)
+        if not stale:
+            return "restored"
+    if not rebuild:
+        return "stale" if snapshot is not None else "missing"
+    try:
+        build(path)
+    except OSError:
+        pass
+    return "rebuilt"
+
+
+def info(path=None):
+    """Size and component list of a snapshot, and whether it is usable as is"""
+    path = Path(path or SNAPSHOT_FILE)
+    snapshot = _read(path)
+    if snapshot is None:
+        return {"path": str(path), "usable": False}
+    components = []
+    for key, (source, fingerprint, blob) in snapshot["components"].items():
+        name = key if isinstance(key, str) else os.path.relpath(source, DATA_DIR)
+        components.append({"component": name, "bytes": len(blob), "fresh": fingerprint == _stat_fingerprint(source)})
+    return {"path": str(path), "usable": True, "bytes": path.stat().st_size, "components": components}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="UI Pro Max Snapshot")
+    parser.add_argument("command", nargs="?", choices=["build", "info"], default="build")
+    parser.add_argument("--file", type=str, default=None, help=f"Snapshot path (default: {SNAPSHOT_FILE})")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(json.dumps(build(args.file), indent=2))
+    else:
+        print(json.dumps(info(args.file), indent=2))
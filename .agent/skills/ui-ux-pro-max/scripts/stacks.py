@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Stacks - Detect a project's stack(s) from its files
+Usage: from stacks import detect_stacks
+       detect_stacks("path/to/project")     ({"stacks": ["nextjs", "react", ...], "evidence": {...}})
+       python search.py "forms" --stack auto [--project-dir path/to/project]
+
+Signals (package.json dependencies, config files, source file extensions) are
+collected from the project directory and up to MARKER_DEPTH levels below it, so
+a monorepo root picks up its apps. Every signal adds a weight to a STACK_CONFIG
+entry; stacks reaching MIN_STACK_SCORE are returned, strongest first.
+
+Detection is cached by a manifest hash of the marker files (path, size, mtime)
+and of the scanned directories' mtimes, in memory and in
+<UIPRO_CACHE_DIR>/stacks.json, so repeat calls only stat a few paths.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from core import DATA_DIR
+
+# ============ CONFIGURATION ============
+STACKS_VERSION = 1
+CACHE_FILE = Path(os.environ.get("UIPRO_CACHE_DIR", DATA_DIR.parent / ".cache")) / "stacks.json"
+SKIP_DIRS = {".git", "node_modules", "dist", "build", ".next", ".nuxt", ".svelte-kit", ".output",
+             "coverage", "__pycache__", ".venv", "venv", "Pods", ".dart_tool", ".gradle"}
+MARKER_DEPTH = 2           # Directory levels below the project root searched for marker files
+MAX_SAMPLE_FILES = 5000    # Source files counted for the extension signal
+MIN_EXTENSION_FILES = 3    # Files of an extension needed before it counts
+MIN_STACK_SCORE = 3
+
+# package.json dependency (exact name, or prefix ending in "/") -> (stack, weight)
+DEPENDENCY_STACKS = {
+    "next": ("nextjs", 3),
+    "react": ("react", 2),
+    "react-native": ("react-native", 4),
+    "expo": ("react-native", 3),
+    "astro": ("astro", 4),
+    "nuxt": ("nuxtjs", 4),
+    "@nuxt/ui": ("nuxt-ui", 4),
+    "vue": ("vue", 2),
+    "svelte": ("svelte", 3),
+    "@sveltejs/kit": ("svelte", 1),
+    "tailwindcss": ("html-tailwind", 2),
+    "@radix-ui/": ("shadcn", 1),
+    "class-variance-authority": ("shadcn", 1)
+}
+# Marker file name (glob) -> (stack, weight); package.json and gradle files are read as well
+CONFIG_STACKS = {
+    "next.config.*": ("nextjs", 3),
+    "astro.config.*": ("astro", 3),
+    "nuxt.config.*": ("nuxtjs", 3),
+    "svelte.config.*": ("svelte", 3),
+    "tailwind.config.*": ("html-tailwind", 1),
+    "components.json": ("shadcn", 3),
+    "pubspec.yaml": ("flutter", 4),
+    "Package.swift": ("swiftui", 2),
+    "*.xcodeproj": ("swiftui", 2)
+}
+GRADLE_FILES = ("build.gradle", "build.gradle.kts")
+GRADLE_COMPOSE = ("jetpack-compose", 4)
+# Source extension -> (stack, weight), counted once MIN_EXTENSION_FILES are seen
+EXTENSION_STACKS = {
+    ".jsx": ("react", 2),
+    ".tsx": ("react", 2),
+    ".vue": ("vue", 3),
+    ".svelte": ("svelte", 3),
+    ".astro": ("astro", 3),
+    ".dart": ("flutter", 3),
+    ".swift": ("swiftui", 2),
+    ".kt": ("jetpack-compose", 1)
+}
+
+_MARKERS = ("package.json",) + GRADLE_FILES + tuple(CONFIG_STACKS)
+_DETECTED = {}  # resolved dir -> (manifest hash, result)
+_LOCK = threading.Lock()
+
+
+# ============ MANIFEST ============
+def _is_marker(name):
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in _MARKERS)
+
+
+def _markers(root):
+    """(marker paths, manifest hash) for a project dir; stats only, no file is read"""
+    markers, entries = [], []
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                children = sorted(it, key=lambda entry: entry.name)
+            entries.append((os.path.relpath(directory, root), os.stat(directory).st_mtime_ns))
+        except OSError:
+            continue
+        for entry in children:
+            if _is_marker(entry.name):
+                stat = entry.stat()
+                markers.append(entry.path)
+                entries.append((os.path.relpath(entry.path, root), stat.st_size, stat.st_mtime_ns))
+            elif depth < MARKER_DEPTH and entry.is_dir(follow_symlinks=False) and entry.name not in SKIP_DIRS \
+                    and not entry.name.startswith("."):
+                stack.append((entry.path, depth + 1))
+    payload = json.dumps([STACKS_VERSION, sorted(entries)])
+    return markers, hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ============ SIGNALS ============
+def _dependency_signals(path):
+    """(stack, weight, evidence) for a package.json's dependencies"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            package = json.load(f)
+    except (OSError, ValueError):
+        return []
+    deps = set()
+    for field in ("dependencies", "devDependencies", "peerDependencies"):
+        if isinstance(package.get(field), dict):
+            deps.update(package[field])
+    signals = {}
+    for dep in sorted(deps):
+        for name, (stack, weight) in DEPENDENCY_STACKS.items():
+            if dep == name or (name.endswith("/") and dep.startswith(name)):
+                # A prefix family (e.g. @radix-ui/*) counts once per package.json
+                signals.setdefault((stack, name), (stack, weight, f"dependency {dep}"))
+    return list(signals.values())
+
+
+def _marker_signals(path):
+    name = os.path.basename(path)
+    if name == "package.json":
+        return _dependency_signals(path)
+    if name in GRADLE_FILES:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            return []
+        return [(*GRADLE_COMPOSE, "compose in gradle build")] if "compose" in text.lower() else []
+    for pattern, (stack, weight) in CONFIG_STACKS.items():
+        if fnmatch.fnmatchcase(name, pattern):
+            return [(stack, weight, name)]
+    return []
+
+
+def _extension_signals(root):
+    """(stack, weight, evidence) for source extensions seen in a bounded walk"""
+    counts = {}
+    seen = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith("."))
+        for name in filenames:
+            ext = os.path.splitext(name)[1].lower()
+            if ext in EXTENSION_STACKS:
+                counts[ext] = counts.get(ext, 0) + 1
+            seen += 1
+        if seen >= MAX_SAMPLE_FILES:
+            break
+    return [(*EXTENSION_STACKS[ext], f"{count} {ext} files") for ext, count in sorted(counts.items())
+            if count >= MIN_EXTENSION_FILES]
+
+
+def _fingerprint(root, markers):
+    """Score every stack from the marker files and extensions: (stacks, evidence)"""
+    scores, evidence = {}, {}
+    signals = [(path, signal) for path in markers for signal in _marker_signals(path)]
+    signals += [(None, signal) for signal in _extension_signals(root)]
+    for path, (stack, weight, why) in signals:
+        scores[stack] = scores.get(stack, 0) + weight
+        where = os.path.relpath(path, root).replace(os.sep, "/") + ": " if path else ""
+        evidence.setdefault(stack, []).append(where + why)
+    stacks = sorted((s for s, score in scores.items() if score >= MIN_STACK_SCORE), key=lambda s: (-scores[s], s))
+    return stacks, {stack: evidence[stack] for stack in stacks}
+
+
+# ============ DETECTION ============
+def _load_disk_cache():
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_disk_cache(key, entry):
+    """Merge one entry into the on-disk cache; failures only cost a future re-detect"""
+    try:
+        cache = _load_disk_cache()
+        cache[key] = entry
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, CACHE_FILE)
+    except OSError:
+        pass
+
+
+def detect_stacks(project_dir=None, use_cache=True):
+    """
+    Stacks of a project directory (default: cwd), strongest first.
+
+    Returns {"dir", "stacks", "evidence": {stack: [signal, ...]}, "cached"}.
+    """
+    root = str(Path(project_dir or os.getcwd()).resolve())
+    markers, manifest = _markers(root)
+    if use_cache:
+        with _LOCK:
+            hit = _DETECTED.get(root)
+        if hit is None:
+            entry = _load_disk_cache().get(root)
+            hit = (entry["manifest"], entry) if entry else None
+        if hit is not None and hit[0] == manifest:
+            with _LOCK:
+                _DETECTED[root] = hit
+            return {"dir": root, "stacks": list(hit[1]["stacks"]), "evidence": hit[1]["evidence"], "cached": True}
+
+    stacks, evidence = _fingerprint(root, markers)
+    entry = {"manifest": manifest, "stacks": stacks, "evidence": evidence}
+    if use_cache:
+        with _LOCK:
+            _DETECTED[root] = (manifest, entry)
+        _save_disk_cache(root, entry)
+    return {"dir": root, "stacks": stacks, "evidence": evidence, "cached": False}
+
+
+if __name__ == "__main__":
+    import sys
+    print(json.dumps(detect_stacks(sys.argv[1] if len(sys.argv) > 1 else None), indent=2))
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Telemetry - Opt-in query log with latency / zero-result summaries
+Usage: UIPRO_TELEMETRY_LOG=/var/log/uipro/queries.jsonl python search.py "glassmorphism"
+       python telemetry.py [--log queries.jsonl] [--top 10] [--prom /var/lib/node_exporter/uipro.prom] [--json]
+
+When UIPRO_TELEMETRY_LOG is set, core.search (and each lookup of a
+core.search_many batch), core.search_stack and
+design_system.generate_design_system append one JSON line per call:
+  {"ts", "kind", "query", "domain", "latency_ms", "cache_hit", "count", "zero", "error"?}
+cache_hit means no index had to be loaded (search / stack) or the memo cache
+answered (design_system); a design_system count is 1 when the query matched a
+product category, 0 otherwise. The log rotates at UIPRO_TELEMETRY_MB (default 8)
+keeping UIPRO_TELEMETRY_BACKUPS (default 3) old files as <log>.1 ... <log>.N.
+
+The summary prints p50/p95/p99 latency and a latency histogram per
+kind/domain plus the most frequent zero-result queries, and can write the
+same numbers in Prometheus text format for the node exporter textfile collector.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+# ============ CONFIGURATION ============
+TELEMETRY_LOG = os.environ.get("UIPRO_TELEMETRY_LOG") or None
+MAX_LOG_BYTES = int(float(os.environ.get("UIPRO_TELEMETRY_MB", "8")) * 1024 * 1024)
+BACKUP_COUNT = int(os.environ.get("UIPRO_TELEMETRY_BACKUPS", "3"))
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_PREFIX = "uipro"
+
+_ROTATE_LOCK = threading.Lock()
+
+
+# ============ RECORDING ============
+def enabled():
+    """True when records are being written"""
+    return TELEMETRY_LOG is not None
+
+
+def _rotate(path):
+    """<log> -> <log>.1 -> ... -> <log>.N (oldest dropped)"""
+    with _ROTATE_LOCK:
+        try:
+            if os.path.getsize(path) < MAX_LOG_BYTES:
+                return  # another thread already rotated
+        except OSError:
+            return
+        for i in range(BACKUP_COUNT - 1, 0, -1):
+            if os.path.exists(f"{path}.{i}"):
+                os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+        if BACKUP_COUNT > 0:
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+
+
+def record(kind, query, domain, latency, cache_hit, count, error=None):
+    """Append one lookup record; never raises, so telemetry cannot break a search"""
+    if TELEMETRY_LOG is None:
+        return
+    entry = {
+        "ts": round(time.time(), 3),
+        "kind": kind,
+        "query": query,
+        "domain": domain,
+        "latency_ms": round(latency * 1000, 3),
+        "cache_hit": bool(cache_hit),
+        "count": count,
+        "zero": count == 0
+    }
+    if error:
+        entry["error"] = error
+    line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+    try:
+        # One O_APPEND write per record keeps lines whole across threads and processes
+        fd = os.open(TELEMETRY_LOG, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size >= MAX_LOG_BYTES:
+            _rotate(TELEMETRY_LOG)
+    except OSError:
+        pass
+
+
+def record_result(kind, result, started, cache_hit):
+    """record() for a search result dict, timed from a time.perf_counter() start"""
+    record(kind, result.get("query"), result.get("stack") or result.get("domain"),
+           time.perf_counter() - started, cache_hit, result.get("count", 0), result.get("error"))
+
+
+# ============ SUMMARY ============
+def read_records(path=None):
+    """Records of the log and its rotated backups, oldest first; malformed lines are skipped"""
+    path = path or TELEMETRY_LOG
+    if not path:
+        raise ValueError("No telemetry log: pass --log or set UIPRO_TELEMETRY_LOG")
+    records = []
+    for candidate in [f"{path}.{i}" for i in range(BACKUP_COUNT, 0, -1)] + [path]:
+        try:
+            with open(candidate, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            continue
+    return records
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list (0.0 if empty)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-int(q * 1000) * len(sorted_values) // 1000))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(records, top=10):
+    """Per kind/domain latency percentiles, histogram and hit/zero counts, plus top zero-result queries"""
+    groups = {}
+    zero_queries = Counter()
+    for r in records:
+        groups.setdefault((r.get("kind", ""), r.get("domain") or ""), []).append(r)
+        if r.get("zero") and not r.get("error"):
+            zero_queries[(r.get("kind", ""), r.get("domain") or "", " ".join(str(r.get("query") or "").lower().split()))] += 1
+
+    series = []
+    for (kind, domain), rows in sorted(groups.items()):
+        latencies = sorted(r.get("latency_ms", 0.0) / 1000 for r in rows)
+        buckets, i = [], 0
+        for bound in LATENCY_BUCKETS:
+            while i < len(latencies) and latencies[i] <= bound:
+                i += 1
+            buckets.append((bound, i))
+        series.append({
+            "kind": kind,
+            "domain": domain,
+            "count": len(rows),
+            "sum": sum(latencies),
+            "quantiles": {q: percentile(latencies, q) for q in QUANTILES},
+            "buckets": buckets,
+            "cache_hits": sum(1 for r in rows if r.get("cache_hit")),
+            "zero": sum(1 for r in rows if r.get("zero")),
+            "errors": sum(1 for r in rows if r.get("error"))
+        })
+    return {
+        "records": len(records),
+        "series": series,
+        "zero_result_queries": [{"kind": kind, "domain": domain, "query": query, "count": count}
+                                for (kind, domain, query), count in zero_queries.most_common(top)]
+    }
+
+
+def _bar(count, total, width=30):
+    return "#" * (round(width * count / total) if total else 0)
+
+
+def format_summary(summary):
+    """Percentile table, a latency histogram per series and the top zero-result queries"""
+    lines = [f"{summary['records']} record(s)", ""]
+    lines.append(f"{'kind':<14} {'domain':<22} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'hit%':>6} {'zero%':>6}")
+    for s in summary["series"]:
+        q = s["quantiles"]
+        lines.append(f"{s['kind']:<14} {s['domain'][:22]:<22} {s['count']:>7} "
+                     f"{q[0.5] * 1000:>9.2f} {q[0.95] * 1000:>9.2f} {q[0.99] * 1000:>9.2f} "
+                     f"{100 * s['cache_hits'] / s['count']:>5.0f}% {100 * s['zero'] / s['count']:>5.0f}%")
+    for s in summary["series"]:
+        lines.append("")
+        lines.append(f"{s['kind']} / {s['domain']}: latency histogram")
+        cumulative = [0] + [n for _, n in s["buckets"]] + [s["count"]]
+        bounds = [bound for bound, _ in s["buckets"]] + [float("inf")]
+        counts = [cumulative[i + 1] - cumulative[i] for i in range(len(bounds))]
+        # Only the span of non-empty buckets
+        used = [i for i, n in enumerate(counts) if n]
+        for i in range(used[0], used[-1] + 1) if used else ():
+            label = "+Inf" if bounds[i] == float("inf") else f"{bounds[i] * 1000:g}ms"
+            lines.append(f"  <= {label:>8} {counts[i]:>7} {_bar(counts[i], s['count'])}")
+    lines.append("")
+    lines.append("Top zero-result queries:")
+    for z in summary["zero_result_queries"] or []:
+        lines.append(f"  {z['count']:>5}  [{z['kind']}/{z['domain']}] {z['query']}")
+    if not summary["zero_result_queries"]:
+        lines.append("  (none)")
+    return "\n".join(lines)
+
+
+def _labels(**labels):
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), " ")}"'
+               for k, v in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def format_prometheus(summary):
+    """Prometheus text exposition of a summary"""
+    p = METRIC_PREFIX
+    lines = [f"# HELP {p}_lookup_duration_seconds Lookup latency.",
+             f"# TYPE {p}_lookup_duration_seconds histogram"]
+    for s in summary["series"]:
+        for bound, cumulative in s["buckets"]:
+            lines.append(f"{p}_lookup_duration_seconds_bucket{_labels(kind=s['kind'], domain=s['domain'], le=f'{bound:g}')} {cumulative}")
+        lines.append(f"{p}_lookup_duration_seconds_bucket{_labels(kind=s['kind'], domain=s['domain'], le='+Inf')} {s['count']}")
+        lines.append(f"{p}_lookup_duration_seconds_sum{_labels(kind=s['kind'], domain=s['domain'])} {s['sum']:.6f}")
+        lines.append(f"{p}_lookup_duration_seconds_count{_labels(kind=s['kind'], domain=s['domain'])} {s['count']}")
+    metrics = [
+        ("lookup_latency_quantile_seconds", "gauge", "Lookup latency percentiles over the current log."),
+        ("lookup_cache_hits_total", "counter", "Lookups served without loading an index or generating."),
+        ("lookup_zero_results_total", "counter", "Lookups that returned no results."),
+        ("lookup_errors_total", "counter", "Lookups that returned an error.")
+    ]
+    for name, kind, help_text in metrics:
+        lines.append(f"# HELP {p}_{name} {help_text}")
+        lines.append(f"# TYPE {p}_{name} {kind}")
+        for s in summary["series"]:
+            if name == "lookup_latency_quantile_seconds":
+                for q, value in s["quantiles"].items():
+                    lines.append(f"{p}_{name}{_labels(kind=s['kind'], domain=s['domain'], quantile=q)} {value:.6f}")
+                continue
+            value = {"lookup_cache_hits_total": s["cache_hits"], "lookup_zero_results_total": s["zero"],
+                     "lookup_errors_total": s["errors"]}[name]
+            lines.append(f"{p}_{name}{_labels(kind=s['kind'], domain=s['domain'])} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(summary, path):
+    """Write the exposition atomically (the textfile collector must never see a partial file)"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(format_prometheus(summary))
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max Telemetry Summary")
+    parser.add_argument("--log", type=str, default=None, help="Telemetry log (default: $UIPRO_TELEMETRY_LOG)")
+    parser.add_argument("--top", type=int, default=10, help="Zero-result queries to list (default: 10)")
+    parser.add_argument("--prom", type=str, default=None, help="Also write Prometheus text format to this file")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        summary = summarize(read_records(args.log), args.top)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.prom:
+        write_prometheus(summary, args.prom)
+    if args.json:
+        for s in summary["series"]:
+            s["quantiles"] = {str(q): value for q, value in s["quantiles"].items()}
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print(format_summary(summary))
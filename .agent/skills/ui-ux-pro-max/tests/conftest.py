@@ -0,0 +1,21 @@
+"""
+Shared setup: scripts/ on sys.path, caches and compiled indexes in a throwaway dir
+Usage: python -m pytest .agent/skills/ui-ux-pro-max/tests
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+# Read by the scripts at import time, so set before any test module imports them
+_WORK_DIR = tempfile.mkdtemp(prefix="uipro-tests-")
+atexit.register(shutil.rmtree, _WORK_DIR, True)
+os.environ["UIPRO_CACHE_DIR"] = os.path.join(_WORK_DIR, "cache")
+os.environ["UIPRO_INDEX_DIR"] = os.path.join(_WORK_DIR, "index")
+os.environ.pop("UIPRO_TELEMETRY_LOG", None)
@@ -0,0 +1,20 @@
+import json
+
+from design_system import load_manifest
+
+
+def test_csv_query_with_commas_stays_one_entry(tmp_path):
+    manifest = tmp_path / "tenants.csv"
+    manifest.write_text('project,query,pages\nBank Co,"fintech, banking app","dashboard, settings; billing"\n'
+                        'Spa,beauty spa wellness,\n', encoding="utf-8")
+    assert load_manifest(str(manifest)) == [
+        {"project": "Bank Co", "query": "fintech, banking app", "pages": ["dashboard", "settings", "billing"]},
+        {"project": "Spa", "query": "beauty spa wellness", "pages": []},
+    ]
+
+
+def test_json_query_with_commas_stays_one_entry(tmp_path):
+    manifest = tmp_path / "tenants.json"
+    manifest.write_text(json.dumps({"projects": [{"name": "Acme", "query": "saas, analytics", "pages": ["a, b"]}]}),
+                        encoding="utf-8")
+    assert load_manifest(str(manifest)) == [{"project": "Acme", "query": "saas, analytics", "pages": ["a, b"]}]
@@ -0,0 +1,31 @@
+import bench
+import indexer
+
+BASELINE = {"metrics": {"search.cost": 2.0, "search.p99_ms": 1.0, "memory.search_kb": 1000, "index.style_bytes": 5000}}
+
+
+def test_suite_runs_against_compiled_indexes():
+    # A compiled index in INDEX_DIR used to replace the in-memory engine and crash the suite
+    filepath, search_cols, output_cols = indexer.resolve_target("style")
+    indexer.build_index(filepath, search_cols, output_cols)
+    assert indexer.has_index(filepath, search_cols)
+    metrics = bench.run_suite(rounds=1, processes=1)
+    assert metrics["search.cost"] > 0 and metrics["generate.cost"] > 0
+    assert indexer.has_index(filepath, search_cols)
+
+
+def test_sample_queries_draw_from_compiled_vocabulary():
+    filepath, search_cols, output_cols = indexer.resolve_target("ux")
+    indexer.build_index(filepath, search_cols, output_cols)
+    queries = bench._sample_queries(indexer.open_index(filepath, search_cols, output_cols), 20)
+    assert len(queries) == 20 and all(queries)
+
+
+def test_latency_gates_on_cost_and_reports_ms():
+    current = {"search.cost": 2.4, "search.p99_ms": 3.0, "memory.search_kb": 1010, "index.style_bytes": 5000}
+    status = {row["metric"]: row["status"] for row in bench.compare(BASELINE, current)}
+    assert status == {"search.cost": "ok", "search.p99_ms": "info", "memory.search_kb": "ok", "index.style_bytes": "ok"}
+
+    current.update({"search.cost": 3.2, "index.style_bytes": 5400})
+    status = {row["metric"]: row["status"] for row in bench.compare(BASELINE, current)}
+    assert status["search.cost"] == "regressed" and status["index.style_bytes"] == "regressed"
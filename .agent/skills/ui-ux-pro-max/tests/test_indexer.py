@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from core import CsvIndex
+from indexer import DiskIndex, build_index, resolve_target
+
+
+@pytest.mark.parametrize("target", ["ux", "stack:react"])
+def test_spilled_build_matches_the_in_memory_index(tmp_path, target):
+    filepath, search_cols, output_cols = resolve_target(target)
+    reference = CsvIndex(filepath, search_cols, output_cols)
+    # A zero budget spills a run after every document, so the merge sees one run per row
+    spilled = DiskIndex(build_index(filepath, search_cols, output_cols, tmp_path / "spilled", memory_mb=0))
+    single = DiskIndex(build_index(filepath, search_cols, output_cols, tmp_path / "single"))
+
+    assert (tmp_path / "spilled" / "postings.jsonl").read_bytes() == (tmp_path / "single" / "postings.jsonl").read_bytes()
+    assert spilled.N == reference.N and list(spilled.doc_lengths) == list(reference.doc_lengths)
+    assert spilled.idf == pytest.approx(reference.idf)
+    assert [spilled.fetch(i) for i in range(spilled.N)] == reference.rows
+
+    rng = random.Random(5)
+    vocab = sorted(reference.idf)
+    queries = [" ".join(rng.choices(vocab, k=rng.randint(1, 3))) for _ in range(100)] + ['"keyboard navigation" focus']
+    for query in queries:
+        expected = reference.score(query, 5)
+        got = spilled.score(query, 5)
+        assert [idx for idx, _ in got] == [idx for idx, _ in expected], query
+        assert [score for _, score in got] == pytest.approx([score for _, score in expected]), query
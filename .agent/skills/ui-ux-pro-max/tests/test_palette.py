@@ -0,0 +1,24 @@
+import pytest
+
+from palette import parse_palette, search_color
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("#1E40AF", "#1E40AF"),
+    ("1e40af", "#1e40af"),
+    ("1e40af, f97316", ["#1e40af", "#f97316"]),
+    ("our brand is bad, use #1E40AF.", "#1E40AF"),
+    ("primary=#1E40AF cta: f97316", {"primary": "#1E40AF", "cta": "#f97316"}),
+])
+def test_parse_palette(text, expected):
+    assert parse_palette(text) == expected
+
+
+@pytest.mark.parametrize("text", ["our brand is bad, use #1E40A", "primary=#1E40A", "a bad face"])
+def test_words_and_malformed_hex_are_not_colors(text):
+    with pytest.raises(ValueError):
+        parse_palette(text)
+
+
+def test_search_color_reports_malformed_hex():
+    assert search_color("use #1E40A")["error"] == "Not a hex color: '#1E40A'"
@@ -0,0 +1,28 @@
+import os
+
+from design_system import generate_cached, persist_design_system
+
+
+def _persist(tmp_path):
+    return persist_design_system(generate_cached("saas dashboard", "Acme"), ["settings"], str(tmp_path), "saas dashboard")
+
+
+def test_unchanged_files_are_not_rewritten(tmp_path):
+    assert _persist(tmp_path)["written_files"]
+    assert _persist(tmp_path)["written_files"] == []
+
+
+def test_same_size_hand_edit_is_detected(tmp_path):
+    first = _persist(tmp_path)
+    master = next(path for path in first["created_files"] if path.endswith("MASTER.md"))
+    original = open(master, encoding="utf-8").read()
+    edited = original.replace("#", "%", 1)
+    assert len(edited) == len(original) and edited != original
+    before = os.stat(master)
+    with open(master, "w", encoding="utf-8", newline="") as f:
+        f.write(edited)
+    os.utime(master, ns=(before.st_atime_ns, before.st_mtime_ns + 10**9))  # a later edit
+
+    second = _persist(tmp_path)
+    assert second["written_files"] == [master]
+    assert open(master, encoding="utf-8").read() == original
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+import core
+from core import BM25, CsvIndex
+from indexer import DiskIndex, build_index, resolve_target
+
+
+def _queries(index, count=150, seed=3):
+    rng = random.Random(seed)
+    vocab = sorted(index.idf)
+    return [" ".join(rng.choices(vocab, k=rng.randint(1, 4))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("impact_bits", [None, 16, 8])
+@pytest.mark.parametrize("target", ["ux", "style"])
+def test_early_exit_matches_the_full_sum(monkeypatch, target, impact_bits):
+    index = CsvIndex(*resolve_target(target), impact_bits=impact_bits)
+    queries = _queries(index)
+    monkeypatch.setattr(core, "EARLY_EXIT_MIN_POSTINGS", None)
+    expected = {(q, k): index.score(q, k) for q in queries for k in (1, 3, 10)}
+
+    # Early exit on every query, checking the threshold after each posting
+    monkeypatch.setattr(core, "EARLY_EXIT_MIN_POSTINGS", 1)
+    monkeypatch.setattr(core, "IMPACT_BLOCK", 1)
+    for (q, k), ranking in expected.items():
+        got = index.score(q, k)
+        assert [idx for idx, _ in got] == [idx for idx, _ in ranking], (q, k)
+        assert [score for _, score in got] == pytest.approx([score for _, score in ranking]), (q, k)
+
+
+def test_early_exit_on_a_compiled_index(monkeypatch, tmp_path):
+    index = DiskIndex(build_index(*resolve_target("ux"), tmp_path / "ux"))
+    queries = _queries(index)
+    monkeypatch.setattr(core, "EARLY_EXIT_MIN_POSTINGS", None)
+    expected = {q: index.score(q, 3) for q in queries}
+    monkeypatch.setattr(core, "EARLY_EXIT_MIN_POSTINGS", 1)
+    monkeypatch.setattr(core, "IMPACT_BLOCK", 1)
+    assert {q: index.score(q, 3) for q in queries} == expected
+
+
+def test_phrase_boosts_without_filtering():
+    index = BM25()
+    index.fit(["dark mode toggle", "mode for dark dark colors in dark rooms", "light theme"])
+    ranking = [idx for idx, _ in index.score('"dark mode"')]
+    assert ranking == [0, 1]
+
+
+def test_unmatched_phrase_ranks_like_plain_terms():
+    index = CsvIndex(*resolve_target("stack:react"))
+    assert index.score('"server component"', 3) == index.score("server component", 3) != []
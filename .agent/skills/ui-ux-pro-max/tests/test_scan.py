@@ -0,0 +1,73 @@
+import scan
+
+ACCESSIBLE = '''export function Field() {
+  return (
+    <input className="rounded focus:outline-none focus:ring-2 focus:ring-indigo-500" />
+  )
+}
+export const Row = () => <a className="transition-colors hover:bg-gray-100">Row</a>
+'''
+
+
+def _scan(root, **kwargs):
+    return scan.scan(root, workers=1, **kwargs)
+
+
+def test_accessible_focus_and_hover_styles_produce_no_findings(tmp_path):
+    (tmp_path / "Field.tsx").write_text(ACCESSIBLE, encoding="utf-8")
+    assert _scan(tmp_path, use_cache=False)["findings"] == []
+
+
+def test_bare_outline_none_is_flagged(tmp_path):
+    (tmp_path / "Field.tsx").write_text('<input className="rounded focus:outline-none" />\n', encoding="utf-8")
+    findings = _scan(tmp_path, use_cache=False)["findings"]
+    assert findings and {f["pattern"] for f in findings} == {"focus:outline-none"}
+    assert all(f["line"] == 1 for f in findings)
+
+
+def test_qualified_snippets_need_a_negative_condition():
+    assert scan.code_pattern("focus:outline-none // alone") == "focus:outline-none"
+    assert scan.code_pattern("focus:ring-2 (shows on click too)") is None
+    assert scan.code_pattern("<Tabs> without defaultValue") is None
+    assert scan.code_pattern("Deep prop chains") is None
+
+
+def test_cache_lives_outside_the_scanned_tree(tmp_path):
+    (tmp_path / "Field.tsx").write_text(ACCESSIBLE, encoding="utf-8")
+    first = _scan(tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == ["Field.tsx"]
+    assert scan.cache_path_for(tmp_path).exists()
+    second = _scan(tmp_path)
+    assert (first["scanned"], second["scanned"], second["cached"]) == (1, 0, 1)
+
+
+def test_unwritable_cache_is_not_fatal(tmp_path):
+    (tmp_path / "Field.tsx").write_text(ACCESSIBLE, encoding="utf-8")
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+    report = _scan(tmp_path, cache_path=blocker / "scan.json")
+    assert report["files"] == 1 and report["findings"] == []
+
+
+REACT_HOOK = '''import { Card } from "components/dashboard/"
+export function useChart(el) {
+  let count = 0
+  const node = document.createElement("canvas")
+  const style = { width: 375 }
+  return <input className="rounded focus:outline-none" />
+}
+'''
+
+
+def test_react_project_is_not_held_to_other_frameworks(tmp_path):
+    (tmp_path / "package.json").write_text('{"dependencies": {"react": "^18.2.0", "next": "^14.0.0"}}', encoding="utf-8")
+    (tmp_path / "useChart.tsx").write_text(REACT_HOOK, encoding="utf-8")
+    report = _scan(tmp_path, use_cache=False)
+    assert not {f["source"] for f in report["findings"]} & {"stack:vue", "stack:svelte", "stack:react-native", "stack:nextjs"}
+    assert [(f["line"], f["pattern"]) for f in report["findings"]] == [(6, "focus:outline-none")]
+
+
+def test_a_line_is_reported_once_per_pattern(tmp_path):
+    (tmp_path / "Field.tsx").write_text('<input className="rounded focus:outline-none" />\n', encoding="utf-8")
+    findings = _scan(tmp_path, sources=list(scan.SCAN_SOURCES), use_cache=False)["findings"]
+    assert len(findings) == 1 and findings[0]["pattern"] == "focus:outline-none"
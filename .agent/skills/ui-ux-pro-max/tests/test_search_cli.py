@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+from conftest import SCRIPTS_DIR
+
+
+def test_page_option_does_not_swallow_the_query(tmp_path):
+    subprocess.run([sys.executable, str(SCRIPTS_DIR / "search.py"), "--design-system", "--persist", "--no-snapshot",
+                    "--page", "dashboard", "saas analytics", "--page", "settings, billing", "-o", str(tmp_path)],
+                   check=True, capture_output=True)
+    pages = tmp_path / "design-system" / "saas-analytics" / "pages"
+    assert sorted(path.name for path in pages.iterdir()) == ["billing.md", "dashboard.md", "settings.md"]
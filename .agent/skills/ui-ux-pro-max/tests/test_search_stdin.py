@@ -0,0 +1,33 @@
+import io
+import json
+from pathlib import Path
+
+import search
+
+
+def _serve(*requests):
+    stdout = io.StringIO()
+    search.serve_stdin(io.StringIO("".join(json.dumps(r) + "\n" for r in requests)), stdout)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_json_design_system_request_persists(tmp_path):
+    [response] = _serve({"id": 1, "query": "saas dashboard", "design_system": True, "format": "json",
+                         "persist": True, "page": ["settings"], "project_name": "Acme", "output_dir": str(tmp_path)})
+    assert response["id"] == 1 and response["ok"], response
+    persisted = response["result"]["persisted"]
+    assert Path(persisted["design_system_dir"]) == tmp_path / "design-system" / "acme"
+    assert (tmp_path / "design-system" / "acme" / "MASTER.md").is_file()
+    assert (tmp_path / "design-system" / "acme" / "pages" / "settings.md").is_file()
+    assert all(Path(path).is_file() for path in persisted["created_files"])
+
+
+def test_json_design_system_request_without_persist_writes_nothing(tmp_path):
+    [response] = _serve({"id": 2, "query": "saas dashboard", "design_system": True, "format": "json",
+                         "output_dir": str(tmp_path)})
+    assert response["ok"] and "persisted" not in response["result"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_bad_request_gets_an_error_response():
+    assert _serve({"id": 3, "query": ""}) == [{"id": 3, "ok": False, "error": 'ValueError: request needs a non-empty "query" string'}]
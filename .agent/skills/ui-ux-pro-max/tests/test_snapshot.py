@@ -0,0 +1,10 @@
+import snapshot
+
+
+def test_restore_only_writes_when_asked(tmp_path):
+    path = tmp_path / "snapshot.pickle"
+    assert snapshot.restore(path) == "missing"
+    assert not path.exists()
+    assert snapshot.restore(path, rebuild=True) == "rebuilt"
+    assert path.exists()
+    assert snapshot.restore(path) == "restored"
@@ -0,0 +1,61 @@
+import json
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pptx")
+from pptx import Presentation
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import generate_pptx
+
+SPEC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deck.json")
+
+
+def _write_spec(path, deck):
+    path.write_text(json.dumps(deck, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def _slides(path):
+    """(background, [(shape name, text)]) per slide, in deck order"""
+    prs = Presentation(path)
+    return [(str(slide.background.fill.fore_color.rgb),
+             [(shape.name, shape.text_frame.text if shape.has_text_frame else None) for shape in slide.shapes])
+            for slide in prs.slides]
+
+
+@pytest.fixture
+def deck():
+    with open(SPEC, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_incremental_build_matches_forced_rebuild(tmp_path, deck, capsys):
+    output = str(tmp_path / "deck.pptx")
+    generate_pptx.create_pitch_deck(_write_spec(tmp_path / "deck.json", deck), output)
+
+    deck["slides"][1]["elements"][0]["text"] = "THE REAL PROBLEM"
+    deck["slides"][2], deck["slides"][3] = deck["slides"][3], deck["slides"][2]
+    del deck["slides"][-1]
+    spec = _write_spec(tmp_path / "deck.json", deck)
+    capsys.readouterr()
+    generate_pptx.create_pitch_deck(spec, output)
+    assert f"(1/{len(deck['slides'])} slides rendered)" in capsys.readouterr().out
+
+    forced = str(tmp_path / "forced.pptx")
+    generate_pptx.create_pitch_deck(spec, forced, force=True)
+    assert _slides(output) == _slides(forced)
+    assert ("TextBox 1", "THE REAL PROBLEM") in _slides(output)[1][1]
+
+
+def test_unchanged_spec_is_up_to_date(tmp_path, deck, capsys):
+    output = str(tmp_path / "deck.pptx")
+    spec = _write_spec(tmp_path / "deck.json", deck)
+    generate_pptx.create_pitch_deck(spec, output)
+    before = os.path.getmtime(output)
+    capsys.readouterr()
+    generate_pptx.create_pitch_deck(spec, output)
+    assert "up to date" in capsys.readouterr().out
+    assert os.path.getmtime(output) == before